@@ -246,9 +246,7 @@ class DDLGenerator:
         # For SERIAL/auto-generated single PK, skip (already in column def)
         if len(table.primary_keys) == 1:
             pk_col_name = table.primary_keys[0]
-            pk_col = next(
-                (col for col in table.columns if col.name == pk_col_name), None
-            )
+            pk_col = table.columns_by_name.get(pk_col_name)
             if pk_col and pk_col.is_auto_generated:
                 return ""  # SERIAL already includes PRIMARY KEY
 
@@ -316,21 +314,20 @@ class DDLGenerator:
             target_table_quoted = self._quote_identifier(fk.target_table)
             target_col_quoted = self._quote_identifier(fk.target_column)
 
-            # Build ALTER TABLE statement
-            alter_stmt = (
+            # Add ON DELETE clause if not default
+            on_delete = ""
+            if fk.on_delete and fk.on_delete != "NO ACTION":
+                on_delete = f"\n    ON DELETE {fk.on_delete}"
+
+            # Build ALTER TABLE statement in one piece
+            fk_statements.append(
                 f"ALTER TABLE {full_table_name}\n"
                 f"    ADD CONSTRAINT {constraint_name}\n"
                 f"    FOREIGN KEY ({source_col})\n"
                 f'    REFERENCES "{target_schema}".{target_table_quoted}({target_col_quoted})'
+                f"{on_delete};"
             )
 
-            # Add ON DELETE clause if not default
-            if fk.on_delete and fk.on_delete != "NO ACTION":
-                alter_stmt += f"\n    ON DELETE {fk.on_delete}"
-
-            alter_stmt += ";"
-            fk_statements.append(alter_stmt)
-
         return "\n\n".join(fk_statements)
 
     def _map_postgresql_type(self, data_type: str, udt_name: str) -> str:
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from collections import defaultdict
 
 from ..graph.models import RecordData, RecordIdentifier
 from ..utils.exceptions import CircularDependencyError
@@ -43,22 +43,33 @@ class DependencySorter:
         if not records:
             return []
 
-        logger.info(f"Sorting {len(records)} records by dependencies")
+        # Fast path: a lone record needs no graph, only a self-reference check
+        if len(records) == 1:
+            record = next(iter(records))
+            if record.identifier in record.dependencies:
+                logger.error(
+                    f"Circular dependency detected: {record.identifier} "
+                    "depends on itself"
+                )
+                raise CircularDependencyError(
+                    "Circular dependency detected involving 1 records. "
+                    f"Examples: {[record.identifier]}"
+                )
+            return [record]
+
+        # Map identifiers to records
+        record_map = {record.identifier: record for record in records}
+
+        logger.info(f"Sorting {len(record_map)} records by dependencies")
 
         # Build graph structures
         graph: dict[RecordIdentifier, set[RecordIdentifier]] = defaultdict(set)
-        in_degree: dict[RecordIdentifier, int] = defaultdict(int)
-        record_map: dict[RecordIdentifier, RecordData] = {}
-
         # Initialize - all records start with in-degree 0
-        for record in records:
-            record_map[record.identifier] = record
-            if record.identifier not in in_degree:
-                in_degree[record.identifier] = 0
+        in_degree: dict[RecordIdentifier, int] = dict.fromkeys(record_map, 0)
 
         # Build edges: dependency -> dependent
         # If A depends on B, then B -> A (B must come before A)
-        for record in records:
+        for record in record_map.values():
             for dep in record.dependencies:
                 # Only consider dependencies that are in our record set
                 if dep in record_map:
@@ -67,17 +78,21 @@ class DependencySorter:
 
         logger.debug(f"Built dependency graph with {len(graph)} nodes")
 
-        # Kahn's algorithm: Start with nodes having no dependencies
-        queue: deque[RecordIdentifier] = deque(
-            [node for node in record_map if in_degree[node] == 0]
-        )
+        # Kahn's algorithm: Start with nodes having no dependencies.
+        # Each node is enqueued exactly once, so a plain list consumed through
+        # a head index is enough and avoids deque block allocation.
+        queue: list[RecordIdentifier] = [
+            node for node in record_map if in_degree[node] == 0
+        ]
+        head = 0
 
         sorted_records: list[RecordData] = []
         processed_count = 0
 
-        while queue:
+        while head < len(queue):
             # Get a node with no incoming edges
-            current = queue.popleft()
+            current = queue[head]
+            head += 1
             sorted_records.append(record_map[current])
             processed_count += 1
 
@@ -88,7 +103,7 @@ class DependencySorter:
                     queue.append(neighbor)
 
         # Check for cycles
-        if processed_count != len(records):
+        if processed_count != len(record_map):
             # Find nodes that weren't processed (part of cycle)
             unprocessed = set(record_map.keys()) - {
                 r.identifier for r in sorted_records
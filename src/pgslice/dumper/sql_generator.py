@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import functools
 import json
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Set
 from datetime import date, datetime, time
 from decimal import Decimal
 from typing import Any
@@ -17,9 +20,258 @@ from .ddl_generator import DDLGenerator
 logger = get_logger(__name__)
 
 
+# ============================================================================
+# Scalar value formatters
+# ============================================================================
+
+
+def _format_bool(value: bool) -> str:
+    return "TRUE" if value else "FALSE"
+
+
+def _format_decimal(value: Decimal) -> str:
+    if value.is_nan():
+        return "'NaN'"
+    if value.is_infinite():
+        return "'Infinity'" if value > 0 else "'-Infinity'"
+    # Return as numeric literal (no quotes)
+    return str(value)
+
+
+def _format_float(value: float) -> str:
+    # Handle special float values
+    if value != value:  # NaN
+        return "'NaN'"
+    elif value == float("inf"):
+        return "'Infinity'"
+    elif value == float("-inf"):
+        return "'-Infinity'"
+    return str(value)
+
+
+def _format_str(value: str) -> str:
+    # Common case: nothing to escape, so skip building intermediate strings.
+    # Concatenate rather than format: an f-string would go through
+    # __format__, which str subclasses such as str-mixin enums override.
+    if "'" not in value and "\\" not in value:
+        return "'" + value + "'"
+    # Escape single quotes by doubling them, and backslashes for PostgreSQL
+    escaped = value.replace("'", "''").replace("\\", "\\\\")
+    return f"'{escaped}'"
+
+
+def _format_temporal(value: date | time) -> str:
+    # ISO format (datetime includes timezone when aware)
+    return f"'{value.isoformat()}'"
+
+
+def _format_uuid(value: UUID) -> str:
+    return f"'{str(value)}'"
+
+
+# Shared compact encoder; avoids rebuilding an encoder per json.dumps() call
+_json_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _format_json(value: dict[str, Any] | list[Any]) -> str:
+    json_str = _json_encode(value)
+    escaped = json_str.replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _format_bytes(value: bytes | bytearray | memoryview) -> str:
+    # Bytea - use hex format (.hex() works on the buffer without copying)
+    return f"'\\x{value.hex()}'"
+
+
+def _format_old_id(value: Any) -> str:
+    # FK value emitted as its old ID string, looked up in _pgslice_id_map
+    if value is None:
+        return "NULL"
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+# Exact-type dispatch for _format_value. Lists are absent on purpose: whether
+# they become ARRAY literals or JSON depends on the column type.
+_VALUE_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    type(None): lambda _: "NULL",
+    bool: _format_bool,
+    int: str,
+    Decimal: _format_decimal,
+    float: _format_float,
+    str: _format_str,
+    datetime: _format_temporal,
+    date: _format_temporal,
+    time: _format_temporal,
+    UUID: _format_uuid,
+    dict: _format_json,
+    bytes: _format_bytes,
+    bytearray: _format_bytes,
+    memoryview: _format_bytes,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_subclass_formatter(value_type: type) -> Callable[[Any], str] | None:
+    # Walk the MRO for subclasses of known types (IntEnum, str subclasses, ...).
+    # Matches are memoized here, bounded, rather than added to the constant
+    # exact-type table.
+    for base in value_type.__mro__[1:]:
+        formatter = _VALUE_FORMATTERS.get(base)
+        if formatter is not None:
+            return formatter
+    return None
+
+
+# PostgreSQL caps a statement at 65535 bind parameters. pgslice inlines
+# literals, so the cap does not strictly apply, but it is used as an upper
+# bound on values per INSERT so "unlimited" batches stay a sane size.
+_MAX_VALUES_PER_STATEMENT = 65535
+
+# Natural key detection: text-like column types that can hold a natural key,
+# and lowercase column names/suffixes that usually mark one as unique
+_NATURAL_KEY_DATA_TYPES = frozenset({"character varying", "text", "varchar"})
+_NATURAL_KEY_NAMES = frozenset(
+    {
+        "name",
+        "code",
+        "slug",
+        "email",
+        "username",
+        "key",
+        "identifier",
+        "handle",
+    }
+)
+_NATURAL_KEY_SUFFIXES = ("_code", "_key", "_identifier", "_slug")
+
+
+# information_schema.columns.data_type spells every array type "ARRAY";
+# the lowercase form is accepted for hand-built metadata.
+_ARRAY_DATA_TYPES = frozenset({"ARRAY", "array"})
+
+# PostgreSQL internal array element names that differ from SQL type names.
+# Most others (text, varchar, uuid, etc.) use the same name.
+_ARRAY_ELEMENT_TYPES: dict[str, str] = {
+    "int4": "integer",
+    "int2": "smallint",
+    "int8": "bigint",
+    "float4": "real",
+    "float8": "double precision",
+    "bool": "boolean",
+}
+
+
+# Array element types grouped by how their literals are written
+_ARRAY_NUMERIC_TYPES = frozenset(
+    {
+        "integer",
+        "bigint",
+        "smallint",
+        "int",
+        "numeric",
+        "decimal",
+        "real",
+        "double precision",
+        "float",
+    }
+)
+_ARRAY_BOOLEAN_TYPES = frozenset({"boolean", "bool"})
+
+
+def _format_array_text_element(item: Any) -> str:
+    # Text types (and unknown types): escape quotes and backslashes, skipping
+    # the replace passes for the common value with neither
+    text = str(item)
+    if "'" in text or "\\" in text:
+        text = text.replace("'", "''").replace("\\", "\\\\")
+    return f"'{text}'"
+
+
+def _format_array_bool_element(item: Any) -> str:
+    return "TRUE" if item else "FALSE"
+
+
+def _format_array_dimension(
+    value: list[Any], format_element: Callable[[Any], str]
+) -> str:
+    # One bracketed dimension; nested lists (multidimensional arrays) become
+    # nested brackets, which PostgreSQL accepts inside a single ARRAY[...]
+    if value and isinstance(value[0], list):
+        elements = [_format_array_dimension(item, format_element) for item in value]
+    else:
+        elements = ["NULL" if item is None else format_element(item) for item in value]
+    return f"[{', '.join(elements)}]"
+
+
+@functools.lru_cache(maxsize=256)
+def _array_element_formatter(element_type: str) -> Callable[[Any], str]:
+    element_type_lower = element_type.lower()
+    if element_type_lower in _ARRAY_NUMERIC_TYPES:
+        return str
+    if element_type_lower in _ARRAY_BOOLEAN_TYPES:
+        return _format_array_bool_element
+    return _format_array_text_element
+
+
+@functools.lru_cache(maxsize=256)
+def _array_element_type(udt_name: str) -> str:
+    if udt_name.startswith("_"):
+        element_udt = udt_name[1:]  # Remove underscore prefix
+        return _ARRAY_ELEMENT_TYPES.get(element_udt, element_udt)
+    return udt_name
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_identifier(identifier: str) -> str:
+    # Identifiers repeat across tables and batches, and rarely contain quotes
+    if '"' not in identifier:
+        return f'"{identifier}"'
+    # Escape embedded double quotes by doubling them
+    escaped = identifier.replace('"', '""')
+    return f'"{escaped}"'
+
+
+# Fixed scaffold of the PL/pgSQL remapping script. Variable declarations and
+# the block body are filled in per call; each of their lines ends in "\n".
+_PLPGSQL_SCRIPT_TEMPLATE = """\
+-- Generated by pgslice
+-- Date: {date}
+-- Records: {record_count}
+-- Mode: PL/pgSQL with ID remapping
+
+-- Create temporary table for ID mapping
+CREATE TEMP TABLE IF NOT EXISTS _pgslice_id_map (
+    table_name TEXT NOT NULL,
+    old_id TEXT NOT NULL,
+    new_id TEXT NOT NULL,
+    PRIMARY KEY (table_name, old_id)
+);
+
+-- Main PL/pgSQL block with ID remapping
+DO $$
+DECLARE
+{declarations}BEGIN
+
+{body}END $$;
+
+-- Cleanup
+DROP TABLE IF EXISTS _pgslice_id_map;
+"""
+# Streamed around the body: the head is formatted once, the tail is literal
+_PLPGSQL_SCRIPT_HEAD, _, _PLPGSQL_SCRIPT_TAIL = _PLPGSQL_SCRIPT_TEMPLATE.partition(
+    "{body}"
+)
+
+
 class SQLGenerator:
     """Generates INSERT statements from record data."""
 
+    # Joins composite PK values in _pgslice_id_map.old_id; a separator or
+    # backslash inside a value is escaped with a backslash
+    COMPOSITE_PK_SEPARATOR = "|"
+
     def __init__(
         self,
         schema_introspector: SchemaIntrospector,
@@ -39,10 +291,73 @@ class SQLGenerator:
         self.batch_size = batch_size if batch_size > 0 else 999999
         # Manual natural key overrides from config/CLI
         self.natural_keys = natural_keys or {}
+        # Cache table metadata per table; each introspection is a few queries
+        self._table_metadata_cache: dict[tuple[str, str], Table] = {}
         # Cache column type mappings per table to avoid repeated lookups
         self._column_type_cache: dict[tuple[str, str], dict[str, tuple[str, str]]] = {}
         # Cache natural key detection results per table
         self._natural_key_cache: dict[tuple[str, str], list[str]] = {}
+        # Cache auto-generated PK columns per table
+        self._auto_gen_pk_cache: dict[tuple[str, str], list[str]] = {}
+        # Cache FK columns to remap per (schema, table, remapped tables)
+        self._fk_remap_cache: dict[
+            tuple[str, str, frozenset[tuple[str, str]]], dict[str, tuple[str, str]]
+        ] = {}
+        # Cache FK-remapping SELECT/JOIN skeletons per (schema, table, columns,
+        # remapped tables)
+        self._fk_remap_select_cache: dict[
+            tuple[str, str, tuple[str, ...], frozenset[tuple[str, str]]],
+            tuple[str, str, str],
+        ] = {}
+        # Cache ON CONFLICT decisions per (schema, table, columns, auto-gen PKs)
+        self._on_conflict_cache: dict[
+            tuple[str, str, tuple[str, ...], tuple[str, ...]],
+            tuple[str, list[str] | None],
+        ] = {}
+        # Cache bulk INSERT ON CONFLICT (pk) clauses per table
+        self._pk_conflict_cache: dict[tuple[str, str], str] = {}
+        # Cache quoted INSERT column lists per column tuple
+        self._column_list_cache: dict[tuple[str, ...], str] = {}
+        # Cache per-column value formatters per (schema, table, columns)
+        self._column_formatters_cache: dict[
+            tuple[str, str, tuple[str, ...], frozenset[str]],
+            tuple[tuple[str, Callable[[Any], str]], ...],
+        ] = {}
+
+    def clear_metadata_cache(self) -> None:
+        """
+        Forget cached table metadata and everything derived from it.
+
+        Call this after the schema changes, so the next statements are
+        built from freshly introspected metadata.
+        """
+        self._table_metadata_cache.clear()
+        self._column_type_cache.clear()
+        self._natural_key_cache.clear()
+        self._auto_gen_pk_cache.clear()
+        self._fk_remap_cache.clear()
+        self._fk_remap_select_cache.clear()
+        self._on_conflict_cache.clear()
+        self._pk_conflict_cache.clear()
+        self._column_formatters_cache.clear()
+
+    def _get_table_metadata(self, schema: str, table: str) -> Table:
+        """
+        Get a table's metadata from the introspector, with caching.
+
+        Args:
+            schema: Schema name
+            table: Table name
+
+        Returns:
+            Table metadata, introspected once per table
+        """
+        key = (schema, table)
+        table_metadata = self._table_metadata_cache.get(key)
+        if table_metadata is None:
+            table_metadata = self.introspector.get_table_metadata(schema, table)
+            self._table_metadata_cache[key] = table_metadata
+        return table_metadata
 
     def generate_bulk_insert(self, records: list[RecordData]) -> str:
         """
@@ -62,48 +377,77 @@ class SQLGenerator:
         schema = first_record.identifier.schema_name
         table = first_record.identifier.table_name
 
-        # Get table metadata for primary keys
-        table_metadata = self.introspector.get_table_metadata(schema, table)
-
         # Build column list (same for all rows)
         columns = sorted(first_record.data.keys())
-        columns_sql = ", ".join(f'"{col}"' for col in columns)
-
-        # Get column type mapping for array/JSON distinction
-        column_type_map = self._get_column_types(schema, table)
-
-        # Build VALUES rows
-        values_rows = []
-        for record in records:
-            values = [
-                self._format_value(record.data.get(col), column_type_map.get(col))
-                for col in columns
-            ]
-            values_sql = ", ".join(values)
-            values_rows.append(f"    ({values_sql})")
-
-        values_clause = ",\n".join(values_rows)
+        columns_sql = self._get_column_list_sql(columns)
 
         # Build ON CONFLICT clause
-        if table_metadata.primary_keys:
-            pk_columns = ", ".join(f'"{pk}"' for pk in table_metadata.primary_keys)
-            conflict_clause = f"\nON CONFLICT ({pk_columns}) DO NOTHING"
-        else:
-            conflict_clause = ""
+        conflict_clause = self._get_pk_conflict_clause(schema, table)
 
         # Add comment header with table info
         full_table_name = f'"{schema}"."{table}"'
         comment = f"-- Table: {full_table_name} ({len(records)} record{'s' if len(records) != 1 else ''})"
 
-        # Combine into final statement
-        sql = (
-            f"{comment}\n"
-            f"INSERT INTO {full_table_name} ({columns_sql})\n"
-            f"VALUES\n{values_clause}"
-            f"{conflict_clause};"
+        if len(records) == 1:
+            # Single row: no row list to build and patch
+            (row,) = self._format_rows(schema, table, columns, records)
+            return (
+                f"{comment}\nINSERT INTO {full_table_name} ({columns_sql})\nVALUES\n"
+                f"    ({row}){conflict_clause};"
+            )
+
+        # Accumulate lines and join once, so the VALUES rows are copied a
+        # single time into the final statement
+        sql_lines = [
+            comment,
+            f"INSERT INTO {full_table_name} ({columns_sql})",
+            "VALUES",
+        ]
+        sql_lines.extend(
+            f"    ({row}),"
+            for row in self._format_rows(schema, table, columns, records)
         )
+        # The last row closes the statement instead of continuing the list
+        sql_lines[-1] = f"{sql_lines[-1][:-1]}{conflict_clause};"
+
+        return "\n".join(sql_lines)
+
+    def _rows_per_statement(self, table_records: list[RecordData]) -> int:
+        """
+        Get how many rows of a table to put in one INSERT statement.
+
+        Args:
+            table_records: Records of a single table
+
+        Returns:
+            batch_size, capped so a statement holds at most
+            _MAX_VALUES_PER_STATEMENT values
+        """
+        column_count = len(table_records[0].data) if table_records else 0
+        if column_count == 0:
+            return self.batch_size
+        return min(self.batch_size, max(1, _MAX_VALUES_PER_STATEMENT // column_count))
+
+    def _get_pk_conflict_clause(self, schema: str, table: str) -> str:
+        """
+        Get the primary-key ON CONFLICT DO NOTHING clause for bulk INSERTs.
+
+        Cached per table, since every batch of a table repeats it.
 
-        return sql
+        Returns:
+            Clause prefixed with a newline, or "" if the table has no PK
+        """
+        key = (schema, table)
+        conflict_clause = self._pk_conflict_cache.get(key)
+        if conflict_clause is None:
+            table_metadata = self._get_table_metadata(schema, table)
+            if table_metadata.primary_keys:
+                pk_columns = self._get_column_list_sql(table_metadata.primary_keys)
+                conflict_clause = f"\nON CONFLICT ({pk_columns}) DO NOTHING"
+            else:
+                conflict_clause = ""
+            self._pk_conflict_cache[key] = conflict_clause
+        return conflict_clause
 
     def generate_batch(
         self,
@@ -129,114 +473,168 @@ class SQLGenerator:
         Returns:
             Complete SQL script
         """
-        if keep_pks:
-            return self._generate_batch_with_pks(
-                records, include_transaction, create_schema, database_name, schema_name
-            )
-        else:
-            return self._generate_batch_with_plpgsql_remapping(
-                records, include_transaction, create_schema, database_name, schema_name
+        result = "".join(
+            self.generate_batch_iter(
+                records,
+                include_transaction=include_transaction,
+                keep_pks=keep_pks,
+                create_schema=create_schema,
+                database_name=database_name,
+                schema_name=schema_name,
             )
+        )
+        script_kind = "SQL" if keep_pks else "PL/pgSQL"
+        logger.info(f"Generated {script_kind} script ({len(result)} bytes)")
+        return result
 
-    def _generate_batch_with_pks(
+    def generate_batch_iter(
         self,
         records: list[RecordData],
-        include_transaction: bool,
+        include_transaction: bool = True,
+        keep_pks: bool = False,
         create_schema: bool = False,
         database_name: str | None = None,
         schema_name: str = "public",
-    ) -> str:
+    ) -> Iterator[str]:
         """
-        Generate SQL with original PK values (current behavior).
+        Generate the same SQL as generate_batch(), one piece at a time.
+
+        Pieces are yielded as soon as they are built (header, then each
+        INSERT statement), so a caller writing them out never holds more
+        than one statement of the script in memory. Joining the pieces with
+        "" gives exactly the generate_batch() output.
 
         Args:
             records: List of RecordData in dependency order
             include_transaction: Whether to wrap in BEGIN/COMMIT
+            keep_pks: If True, keep original PK values; if False, exclude
+                auto-generated PKs and use PL/pgSQL remapping
             create_schema: If True, include DDL statements
             database_name: Database name for CREATE DATABASE (required if create_schema=True)
             schema_name: Schema name for CREATE SCHEMA
 
-        Returns:
-            Complete SQL script with all bulk INSERT statements
+        Yields:
+            Consecutive chunks of the SQL script
         """
-        from collections import defaultdict
-
-        logger.info(
-            f"Generating SQL for {len(records)} records (batch_size={self.batch_size})"
-        )
+        # Deduplicate once, before either generation path groups by table
+        records = self._deduplicate_records(records)
 
-        sql_statements = []
-
-        # Add DDL if requested
-        if create_schema and database_name:
-            ddl_generator = DDLGenerator(self.introspector)
-
-            # Collect unique tables from records
-            unique_tables = {
-                (record.identifier.schema_name, record.identifier.table_name)
-                for record in records
-            }
-
-            ddl = ddl_generator.generate_ddl(database_name, schema_name, unique_tables)
-            sql_statements.append(ddl)
-            sql_statements.append("")  # Blank line separator
-
-        # Add header
-        header = [
-            "-- Generated by pgslice",
-            f"-- Date: {datetime.now().isoformat()}",
-            f"-- Records: {len(records)}",
-            f"-- Batch size: {self.batch_size}",
-            "",
-        ]
+        if keep_pks:
+            yield from self._iter_batch_with_pks(
+                records, include_transaction, create_schema, database_name, schema_name
+            )
+        else:
+            yield from self._iter_batch_with_plpgsql_remapping(
+                records, include_transaction, create_schema, database_name, schema_name
+            )
 
-        sql_statements.extend(header)
+    def _deduplicate_records(self, records: list[RecordData]) -> list[RecordData]:
+        """
+        Drop records whose identifier was already seen, keeping the first.
 
-        # Add BEGIN if transaction requested
-        if include_transaction:
-            sql_statements.append("BEGIN;")
-            sql_statements.append("")
+        Args:
+            records: List of RecordData in dependency order
 
-        # BEFORE grouping by table, deduplicate based on RecordIdentifier
-        seen_identifiers: set[RecordIdentifier] = set()
-        unique_records: list[RecordData] = []
+        Returns:
+            Records with unique identifiers, in their original order
+        """
+        unique: dict[RecordIdentifier, RecordData] = {}
         duplicate_count = 0
 
         for record in records:
-            if record.identifier not in seen_identifiers:
-                seen_identifiers.add(record.identifier)
-                unique_records.append(record)
-            else:
+            if record.identifier in unique:
                 duplicate_count += 1
                 logger.warning(
                     f"Duplicate #{duplicate_count} detected and skipped: {record.identifier}"
                 )
+            else:
+                unique[record.identifier] = record
 
         if duplicate_count > 0:
             logger.info(f"Deduplicated {duplicate_count} duplicate record(s)")
 
-        # Group unique records by table (preserving dependency order within each table)
+        return list(unique.values())
+
+    def _group_records_by_table(
+        self, records: list[RecordData]
+    ) -> dict[tuple[str, str], list[RecordData]]:
+        """
+        Group records by (schema, table), keeping their relative order.
+
+        Args:
+            records: List of RecordData in dependency order
+
+        Returns:
+            Dict mapping (schema, table) -> records, in first-seen table order
+        """
         records_by_table: dict[tuple[str, str], list[RecordData]] = defaultdict(list)
-        for record in unique_records:
-            key = (record.identifier.schema_name, record.identifier.table_name)
-            records_by_table[key].append(record)
+        for record in records:
+            identifier = record.identifier
+            records_by_table[(identifier.schema_name, identifier.table_name)].append(
+                record
+            )
+        return records_by_table
+
+    def _iter_batch_with_pks(
+        self,
+        records: list[RecordData],
+        include_transaction: bool,
+        create_schema: bool = False,
+        database_name: str | None = None,
+        schema_name: str = "public",
+    ) -> Iterator[str]:
+        """
+        Generate SQL with original PK values (current behavior), in chunks.
+
+        Args:
+            records: List of RecordData in dependency order
+            include_transaction: Whether to wrap in BEGIN/COMMIT
+            create_schema: If True, include DDL statements
+            database_name: Database name for CREATE DATABASE (required if create_schema=True)
+            schema_name: Schema name for CREATE SCHEMA
+
+        Yields:
+            Chunks of the SQL script with all bulk INSERT statements
+        """
+        logger.info(
+            f"Generating SQL for {len(records)} records (batch_size={self.batch_size})"
+        )
+
+        # Group records by table in one pass (preserving dependency order)
+        records_by_table = self._group_records_by_table(records)
+
+        # Add DDL if requested, followed by a blank line
+        if create_schema and database_name:
+            ddl_generator = DDLGenerator(self.introspector)
+            ddl = ddl_generator.generate_ddl(
+                database_name, schema_name, set(records_by_table)
+            )
+            yield f"{ddl}\n\n"
+
+        # Add header; every later chunk starts on the line after it
+        yield (
+            "-- Generated by pgslice\n"
+            f"-- Date: {datetime.now().isoformat()}\n"
+            f"-- Records: {len(records)}\n"
+            f"-- Batch size: {self.batch_size}\n"
+        )
+
+        # Add BEGIN if transaction requested
+        if include_transaction:
+            yield "\nBEGIN;\n"
 
         # Generate bulk INSERTs for each table with batching
         for (_schema, _table), table_records in records_by_table.items():
             # Split into batches
-            for i in range(0, len(table_records), self.batch_size):
-                batch = table_records[i : i + self.batch_size]
-                bulk_insert = self.generate_bulk_insert(batch)
-                sql_statements.append(bulk_insert)
-                sql_statements.append("")  # Blank line between batches
+            rows_per_statement = self._rows_per_statement(table_records)
+            for i in range(0, len(table_records), rows_per_statement):
+                batch = table_records[i : i + rows_per_statement]
+                # Blank line between batches
+                yield f"\n{self.generate_bulk_insert(batch)}\n"
 
         # Add COMMIT if transaction requested
         if include_transaction:
-            sql_statements.append("COMMIT;")
-
-        result = "\n".join(sql_statements)
-        logger.info(f"Generated SQL script ({len(result)} bytes)")
-        return result
+            yield "\nCOMMIT;"
 
     def _get_column_types(self, schema: str, table: str) -> dict[str, tuple[str, str]]:
         """
@@ -251,12 +649,147 @@ class SQLGenerator:
         """
         key = (schema, table)
         if key not in self._column_type_cache:
-            table_metadata = self.introspector.get_table_metadata(schema, table)
+            table_metadata = self._get_table_metadata(schema, table)
             self._column_type_cache[key] = {
                 c.name: (c.data_type, c.udt_name) for c in table_metadata.columns
             }
         return self._column_type_cache[key]
 
+    def _get_column_formatters(
+        self,
+        schema: str,
+        table: str,
+        columns: list[str],
+        old_id_columns: frozenset[str] = frozenset(),
+    ) -> tuple[tuple[str, Callable[[Any], str]], ...]:
+        """
+        Get the (column, value formatter) pairs for a column list, with caching.
+
+        Args:
+            schema: Schema name
+            table: Table name
+            columns: Ordered column names to emit
+            old_id_columns: FK columns to emit as their old ID string
+
+        Returns:
+            Tuple of (column name, formatter) pairs in column order
+        """
+        key = (schema, table, tuple(columns), old_id_columns)
+        column_formatters = self._column_formatters_cache.get(key)
+        if column_formatters is None:
+            column_type_map = self._get_column_types(schema, table)
+            column_formatters = tuple(
+                (
+                    col,
+                    _format_old_id
+                    if col in old_id_columns
+                    else self._get_column_formatter(column_type_map.get(col)),
+                )
+                for col in columns
+            )
+            self._column_formatters_cache[key] = column_formatters
+        return column_formatters
+
+    def _format_rows(
+        self,
+        schema: str,
+        table: str,
+        columns: list[str],
+        records: list[RecordData],
+        old_id_columns: frozenset[str] = frozenset(),
+    ) -> list[str]:
+        """
+        Format the VALUES rows of a batch, one column at a time.
+
+        When every value of a column in the batch has the same exact type
+        (an all-integer id column, say), that type's formatter is mapped
+        over the column directly instead of dispatching on each value.
+
+        Args:
+            schema: Schema name
+            table: Table name
+            columns: Ordered column names to emit
+            records: Records of the batch, all from this table
+            old_id_columns: FK columns to emit as their old ID string
+
+        Returns:
+            One "v1, v2, ..." string per record, in record order
+        """
+        if not columns:
+            return [""] * len(records)
+
+        formatted_columns = []
+        for col, format_value in self._get_column_formatters(
+            schema, table, columns, old_id_columns
+        ):
+            values = [record.data.get(col) for record in records]
+            if col not in old_id_columns:
+                value_types = set(map(type, values))
+                if len(value_types) == 1:
+                    format_value = (
+                        _VALUE_FORMATTERS.get(value_types.pop()) or format_value
+                    )
+            formatted_columns.append(list(map(format_value, values)))
+        return list(map(", ".join, zip(*formatted_columns, strict=True)))
+
+    def _get_values_lines(self, rows: list[str]) -> list[str]:
+        """
+        Get the indented lines of a PL/pgSQL VALUES list.
+
+        Args:
+            rows: Formatted "v1, v2, ..." rows, at least one
+
+        Returns:
+            One "(v1, v2, ...)," line per row; the last has no trailing comma
+        """
+        value_lines = [f"        ({row})," for row in rows]
+        value_lines[-1] = value_lines[-1][:-1]
+        return value_lines
+
+    def _get_column_list_sql(self, columns: list[str]) -> str:
+        """
+        Get the quoted, comma-separated column list for an INSERT.
+
+        Cached per column tuple, since every batch of a table repeats it.
+
+        Args:
+            columns: Column names in INSERT order
+
+        Returns:
+            Column list SQL, e.g. '"id", "name"'
+        """
+        key = tuple(columns)
+        columns_sql = self._column_list_cache.get(key)
+        if columns_sql is None:
+            columns_sql = ", ".join(map(_quote_identifier, columns))
+            self._column_list_cache[key] = columns_sql
+        return columns_sql
+
+    def _get_column_formatter(
+        self, column_type_info: tuple[str, str] | None
+    ) -> Callable[[Any], str]:
+        """
+        Pick the value formatter for a column from its type information.
+
+        Args:
+            column_type_info: (data_type, udt_name) tuple, or None if unknown
+
+        Returns:
+            Callable formatting a single value as SQL literal
+        """
+        if column_type_info and column_type_info[0] in _ARRAY_DATA_TYPES:
+            element_type = self._get_array_element_type(column_type_info[1])
+
+            def format_array_column(value: Any) -> str:
+                if isinstance(value, list):
+                    return self._format_array_value(value, element_type)
+                return self._format_value(value)
+
+            return format_array_column
+
+        # Non-array columns format lists as JSON, which needs no type info
+        return self._format_value
+
     def _quote_identifier(self, identifier: str) -> str:
         """
         Quote a SQL identifier safely.
@@ -275,9 +808,7 @@ class SQLGenerator:
             "references" -> '"references"'
             'col"name' -> '"col""name"'  (escaped quote)
         """
-        # Escape embedded double quotes by doubling them
-        escaped = identifier.replace('"', '""')
-        return f'"{escaped}"'
+        return _quote_identifier(identifier)
 
     def _is_array_type(self, data_type: str) -> bool:
         """
@@ -292,7 +823,7 @@ class SQLGenerator:
         Returns:
             True if the type is an array type
         """
-        return data_type.upper() == "ARRAY"
+        return data_type in _ARRAY_DATA_TYPES
 
     def _get_array_element_type(self, udt_name: str) -> str:
         """
@@ -314,23 +845,7 @@ class SQLGenerator:
             "_int4" → "integer"
             "_varchar" → "varchar"
         """
-        if udt_name.startswith("_"):
-            element_udt = udt_name[1:]  # Remove underscore prefix
-
-            # Map PostgreSQL internal names to SQL type names
-            type_mapping = {
-                "int4": "integer",
-                "int2": "smallint",
-                "int8": "bigint",
-                "float4": "real",
-                "float8": "double precision",
-                "bool": "boolean",
-                # Most others (text, varchar, uuid, etc.) use the same name
-            }
-
-            return type_mapping.get(element_udt, element_udt)
-
-        return udt_name
+        return _array_element_type(udt_name)
 
     def _format_array_value(self, value: list[Any], element_type: str) -> str:
         """
@@ -348,67 +863,15 @@ class SQLGenerator:
         Examples:
             ['foo', 'bar'], 'text' -> ARRAY['foo', 'bar']::text[]
             [1, 2, 3], 'integer' -> ARRAY[1, 2, 3]::integer[]
+            [[1, 2], [3, 4]], 'integer' -> ARRAY[[1, 2], [3, 4]]::integer[]
             [], 'text' -> ARRAY[]::text[]
         """
-        # Check for nested arrays (multidimensional)
-        if value and isinstance(value[0], list):
-            logger.warning(
-                f"Multidimensional arrays not yet supported, using JSON: {value}"
-            )
-            # Fall back to JSON formatting
-            json_str = json.dumps(value)
-            escaped = json_str.replace("'", "''")
-            return f"'{escaped}'"
-
-        if not value:
-            # Empty array
-            return f"ARRAY[]::{element_type}[]"
-
-        # Determine if element type needs quoting
-        text_types = {
-            "text",
-            "character varying",
-            "varchar",
-            "char",
-            "character",
-            "uuid",
-        }
-        numeric_types = {
-            "integer",
-            "bigint",
-            "smallint",
-            "int",
-            "numeric",
-            "decimal",
-            "real",
-            "double precision",
-            "float",
-        }
-        boolean_types = {"boolean", "bool"}
-
-        formatted_elements = []
-        element_type_lower = element_type.lower()
-
-        for item in value:
-            if item is None:
-                formatted_elements.append("NULL")
-            elif element_type_lower in text_types or element_type in text_types:
-                # Text types: escape quotes and backslashes
-                escaped = str(item).replace("'", "''").replace("\\", "\\\\")
-                formatted_elements.append(f"'{escaped}'")
-            elif element_type_lower in numeric_types:
-                # Numeric types: no quotes
-                formatted_elements.append(str(item))
-            elif element_type_lower in boolean_types:
-                # Boolean types
-                formatted_elements.append("TRUE" if item else "FALSE")
-            else:
-                # Fallback: treat as string
-                escaped = str(item).replace("'", "''").replace("\\", "\\\\")
-                formatted_elements.append(f"'{escaped}'")
-
-        elements_str = ", ".join(formatted_elements)
-        return f"ARRAY[{elements_str}]::{element_type}[]"
+        # Pick the element formatter once instead of per item; numeric types
+        # get plain str() with no escaping
+        format_element = _array_element_formatter(element_type)
+        return (
+            f"ARRAY{_format_array_dimension(value, format_element)}::{element_type}[]"
+        )
 
     def _format_value(
         self, value: Any, column_type_info: tuple[str, str] | None = None
@@ -435,96 +898,48 @@ class SQLGenerator:
         - JSON/JSONB (dict, list with json/jsonb column type, or no type info)
         - Bytea (bytes)
         """
-        if value is None:
-            return "NULL"
+        # Fast path: exact type lookup instead of an isinstance() ladder
+        formatter = _VALUE_FORMATTERS.get(type(value))
+        if formatter is not None:
+            return formatter(value)
 
-        elif isinstance(value, bool):
-            # Must come before int check (bool is subclass of int)
-            return "TRUE" if value else "FALSE"
-
-        elif isinstance(value, int):
-            return str(value)
-
-        elif isinstance(value, Decimal):
-            # Handle Decimal (before float, since we want numeric output)
-            if value.is_nan():
-                return "'NaN'"
-            if value.is_infinite():
-                return "'Infinity'" if value > 0 else "'-Infinity'"
-            # Return as numeric literal (no quotes)
-            return str(value)
-
-        elif isinstance(value, float):
-            # Handle special float values
-            if value != value:  # NaN
-                return "'NaN'"
-            elif value == float("inf"):
-                return "'Infinity'"
-            elif value == float("-inf"):
-                return "'-Infinity'"
-            return str(value)
-
-        elif isinstance(value, str):
-            # Escape single quotes by doubling them
-            escaped = value.replace("'", "''")
-            # Also escape backslashes for PostgreSQL
-            escaped = escaped.replace("\\", "\\\\")
-            return f"'{escaped}'"
-
-        elif isinstance(value, datetime):
-            # ISO format with timezone
-            return f"'{value.isoformat()}'"
-
-        elif isinstance(value, (date, time)):
-            return f"'{value.isoformat()}'"
-
-        elif isinstance(value, UUID):
-            return f"'{str(value)}'"
-
-        elif isinstance(value, (dict, list)):
+        if isinstance(value, list):
             # CRITICAL: Distinguish between PostgreSQL arrays and JSON
-            if column_type_info and isinstance(value, list):
+            if column_type_info:
                 data_type, udt_name = column_type_info
-                if self._is_array_type(data_type):
+                if data_type in _ARRAY_DATA_TYPES:
                     element_type = self._get_array_element_type(udt_name)
                     return self._format_array_value(value, element_type)
 
             # Fall through to JSON handling for:
-            # - dict values (always JSON)
             # - list values with json/jsonb column type
             # - list values with no type info (backward compatibility)
-            json_str = json.dumps(value)
-            escaped = json_str.replace("'", "''")
-            return f"'{escaped}'"
+            return _format_json(value)
 
-        elif isinstance(value, bytes):
-            # Bytea - use hex format
-            hex_str = value.hex()
-            return f"'\\x{hex_str}'"
+        # Subclasses of known types (IntEnum, str subclasses, ...)
+        value_type: type = type(value)
+        formatter = _resolve_subclass_formatter(value_type)
+        if formatter is not None:
+            return formatter(value)
 
-        elif isinstance(value, memoryview):
-            # Convert memoryview to bytes
-            return self._format_value(bytes(value), column_type_info)
-
-        else:
-            # Fallback: convert to string and escape
-            logger.warning(
-                f"Unknown type {type(value)} for value {value}, converting to string"
-            )
-            return self._format_value(str(value))
+        # Fallback: convert to string and escape
+        logger.warning(
+            f"Unknown type {type(value)} for value {value}, converting to string"
+        )
+        return _format_str(str(value))
 
     # ============================================================================
     # PL/pgSQL Generation with ID Remapping
     # ============================================================================
 
-    def _generate_batch_with_plpgsql_remapping(
+    def _iter_batch_with_plpgsql_remapping(
         self,
         records: list[RecordData],
         include_transaction: bool,
         create_schema: bool = False,
         database_name: str | None = None,
         schema_name: str = "public",
-    ) -> str:
+    ) -> Iterator[str]:
         """
         Generate PL/pgSQL script with ID remapping for auto-generated PKs.
 
@@ -546,130 +961,67 @@ class SQLGenerator:
             database_name: Database name for CREATE DATABASE (required if create_schema=True)
             schema_name: Schema name for CREATE SCHEMA
 
-        Returns:
-            PL/pgSQL script as string
+        Yields:
+            Chunks of the PL/pgSQL script
         """
-        from collections import defaultdict
-
         logger.info(f"Generating PL/pgSQL with ID remapping for {len(records)} records")
 
-        sql_statements = []
+        # Group records by table in one pass (preserving dependency order)
+        records_by_table = self._group_records_by_table(records)
 
-        # Add DDL if requested
+        # Add DDL if requested, followed by a blank line
         if create_schema and database_name:
             ddl_generator = DDLGenerator(self.introspector)
-
-            # Collect unique tables from records
-            unique_tables = {
-                (record.identifier.schema_name, record.identifier.table_name)
-                for record in records
-            }
-
-            ddl = ddl_generator.generate_ddl(database_name, schema_name, unique_tables)
-            sql_statements.append(ddl)
-            sql_statements.append("")  # Blank line separator
-
-        # 1. Deduplicate records (same as duplicate bug fix)
-        seen_identifiers: set[RecordIdentifier] = set()
-        unique_records: list[RecordData] = []
-        duplicate_count = 0
-
-        for record in records:
-            if record.identifier not in seen_identifiers:
-                seen_identifiers.add(record.identifier)
-                unique_records.append(record)
-            else:
-                duplicate_count += 1
-                logger.warning(
-                    f"Duplicate #{duplicate_count} detected and skipped: {record.identifier}"
-                )
-
-        if duplicate_count > 0:
-            logger.info(f"Deduplicated {duplicate_count} duplicate record(s)")
-
-        # 2. Group by table (preserving dependency order)
-        records_by_table: dict[tuple[str, str], list[RecordData]] = defaultdict(list)
-        for record in unique_records:
-            key = (record.identifier.schema_name, record.identifier.table_name)
-            records_by_table[key].append(record)
-
-        # 3. Identify tables with auto-generated PKs
-        tables_with_remapped_ids: set[tuple[str, str]] = set()
-        for schema, table in records_by_table:
-            if self._has_auto_generated_pks(schema, table):
-                tables_with_remapped_ids.add((schema, table))
-
-        # 4. Build SQL script
-        sql_parts = []
-
-        # Header
-        sql_parts.extend(
-            [
-                "-- Generated by pgslice",
-                f"-- Date: {datetime.now().isoformat()}",
-                f"-- Records: {len(unique_records)}",
-                "-- Mode: PL/pgSQL with ID remapping",
-                "",
-            ]
-        )
-
-        # Create temp table for ID mappings
-        sql_parts.extend(
-            [
-                "-- Create temporary table for ID mapping",
-                "CREATE TEMP TABLE IF NOT EXISTS _pgslice_id_map (",
-                "    table_name TEXT NOT NULL,",
-                "    old_id TEXT NOT NULL,",
-                "    new_id TEXT NOT NULL,",
-                "    PRIMARY KEY (table_name, old_id)",
-                ");",
-                "",
-            ]
-        )
-
-        # Start PL/pgSQL block
-        sql_parts.extend(
-            [
-                "-- Main PL/pgSQL block with ID remapping",
-                "DO $$",
-                "DECLARE",
-            ]
+            ddl = ddl_generator.generate_ddl(
+                database_name, schema_name, set(records_by_table)
+            )
+            yield f"{ddl}\n\n"
+
+        # 1. Identify tables with auto-generated PKs. Frozen once here, so
+        # the per-batch cache keys below reuse it instead of copying it.
+        tables_with_remapped_ids = frozenset(
+            (schema, table)
+            for schema, table in records_by_table
+            if self._has_auto_generated_pks(schema, table)
         )
 
+        # 2. Build SQL script from the fixed scaffold template
+        declarations: list[str] = []
         # Declare variables for each table with remapping
         for schema, table in tables_with_remapped_ids:
             auto_gen_pks = self._get_auto_generated_pk_columns(schema, table)
             if auto_gen_pks:
                 # Get the data type of the first PK column for variable declaration
-                table_meta = self.introspector.get_table_metadata(schema, table)
+                table_meta = self._get_table_metadata(schema, table)
                 pk_col = auto_gen_pks[0]
-                col_info = next(
-                    (c for c in table_meta.columns if c.name == pk_col), None
-                )
+                col_info = table_meta.columns_by_name.get(pk_col)
                 if col_info:
                     pg_type = col_info.data_type
-                    sql_parts.append(f"    v_new_id_{table} {pg_type};")
-                    sql_parts.append(f"    v_new_ids_{table} {pg_type}[];")
-                    sql_parts.append(f"    v_old_ids_{table} TEXT[];")
-
-        sql_parts.extend(
-            [
-                "    i INTEGER;",
-                "BEGIN",
-                "",
-            ]
+                    declarations.append(f"    v_new_id_{table} {pg_type};")
+                    declarations.append(f"    v_new_ids_{table} {pg_type}[];")
+                    declarations.append(f"    v_old_ids_{table} TEXT[];")
+
+        yield _PLPGSQL_SCRIPT_HEAD.format_map(
+            {
+                "date": datetime.now().isoformat(),
+                "record_count": len(records),
+                "declarations": "".join(f"{line}\n" for line in declarations),
+            }
         )
 
+        # Sequence sync lines, emitted as one chunk of "\n"-terminated lines
+        sync_lines: list[str] = []
+
         # Add sequence synchronization to prevent conflicts
         if tables_with_remapped_ids:
-            sql_parts.append("    -- Synchronize sequences to prevent ID conflicts")
+            sync_lines.append("    -- Synchronize sequences to prevent ID conflicts")
             for schema, table in tables_with_remapped_ids:
                 auto_gen_pks = self._get_auto_generated_pk_columns(schema, table)
                 for pk_col in auto_gen_pks:
                     try:
                         seq_name = self._get_sequence_name(schema, table, pk_col)
                         full_table_name = f'"{schema}"."{table}"'
-                        sql_parts.append(
+                        sync_lines.append(
                             f"    PERFORM setval('{seq_name}', "
                             f'COALESCE((SELECT MAX("{pk_col}") FROM {full_table_name}), 1));'
                         )
@@ -678,29 +1030,29 @@ class SQLGenerator:
                         logger.debug(
                             f"Skipping sequence sync for {schema}.{table}.{pk_col} (no sequence)"
                         )
-            sql_parts.append("")  # Blank line after sequence sync
+            sync_lines.append("")  # Blank line after sequence sync
+            yield "".join(f"{line}\n" for line in sync_lines)
 
-        # 5. Generate INSERT statements for each table
+        # 3. Generate INSERT statements for each table
         for (schema, table), table_records in records_by_table.items():
             full_table_name = f'"{schema}"."{table}"'
             has_remapped_ids = (schema, table) in tables_with_remapped_ids
+            # Same for every batch of the table, so decide once up front:
+            # does this table ALSO have FKs to remapped tables?
+            has_fk_to_remap = has_remapped_ids and bool(
+                self._get_fk_columns_to_remap(schema, table, tables_with_remapped_ids)
+            )
 
             # Add comment
-            sql_parts.append(
-                f"    -- Table: {full_table_name} ({len(table_records)} records)"
-            )
+            yield f"    -- Table: {full_table_name} ({len(table_records)} records)\n"
 
             # Split into batches
-            for i in range(0, len(table_records), self.batch_size):
-                batch = table_records[i : i + self.batch_size]
+            rows_per_statement = self._rows_per_statement(table_records)
+            for i in range(0, len(table_records), rows_per_statement):
+                batch = table_records[i : i + rows_per_statement]
 
                 if has_remapped_ids:
-                    # Check if this table ALSO has FKs to remapped tables
-                    fk_to_remap = self._get_fk_columns_to_remap(
-                        schema, table, tables_with_remapped_ids
-                    )
-
-                    if fk_to_remap:
+                    if has_fk_to_remap:
                         # Has auto-gen PKs AND FKs to remap → use FK remapping method
                         # It will handle both FK remapping AND PK RETURNING
                         insert_sql = self._generate_insert_with_fk_remapping(
@@ -717,54 +1069,32 @@ class SQLGenerator:
                         schema, table, batch, tables_with_remapped_ids
                     )
 
-                sql_parts.append(insert_sql)
-                sql_parts.append("")
+                yield f"{insert_sql}\n\n"
 
-        # End PL/pgSQL block
-        sql_parts.extend(
-            [
-                "END $$;",
-                "",
-            ]
-        )
-
-        # Drop temp table
-        sql_parts.extend(
-            [
-                "-- Cleanup",
-                "DROP TABLE IF EXISTS _pgslice_id_map;",
-                "",
-            ]
-        )
-
-        # Combine DDL (if any) with PL/pgSQL script
-        if sql_statements:
-            # sql_statements contains DDL, add PL/pgSQL parts after
-            sql_statements.extend(sql_parts)
-            result = "\n".join(sql_statements)
-        else:
-            result = "\n".join(sql_parts)
-
-        logger.info(f"Generated PL/pgSQL script ({len(result)} bytes)")
-        return result
+        yield _PLPGSQL_SCRIPT_TAIL
 
     def _get_auto_generated_pk_columns(self, schema: str, table: str) -> list[str]:
         """
         Get list of auto-generated PK columns for a table.
 
+        Results are cached per table for the generator's lifetime.
+
         Returns:
             List of column names that are both PK and auto-generated
         """
-        table_meta = self.introspector.get_table_metadata(schema, table)
-        auto_gen_pks = []
-        for col in table_meta.columns:
-            if col.is_primary_key and col.is_auto_generated:
-                auto_gen_pks.append(col.name)
-        return auto_gen_pks
+        key = (schema, table)
+        if key not in self._auto_gen_pk_cache:
+            table_meta = self._get_table_metadata(schema, table)
+            self._auto_gen_pk_cache[key] = [
+                col.name
+                for col in table_meta.columns
+                if col.is_primary_key and col.is_auto_generated
+            ]
+        return self._auto_gen_pk_cache[key]
 
     def _has_auto_generated_pks(self, schema: str, table: str) -> bool:
-        """Check if table has any auto-generated PK columns."""
-        return len(self._get_auto_generated_pk_columns(schema, table)) > 0
+        """Check if table has any auto-generated PK columns (cached per table)."""
+        return bool(self._get_auto_generated_pk_columns(schema, table))
 
     def _get_sequence_name(self, schema: str, table: str, column: str) -> str:
         """
@@ -818,7 +1148,7 @@ class SQLGenerator:
         return ("public", qualified_name)  # Default schema
 
     def _get_fk_columns_to_remap(
-        self, schema: str, table: str, tables_with_remapped_ids: set[tuple[str, str]]
+        self, schema: str, table: str, tables_with_remapped_ids: Set[tuple[str, str]]
     ) -> dict[str, tuple[str, str]]:
         """
         Get FK columns that reference tables with remapped IDs.
@@ -831,7 +1161,12 @@ class SQLGenerator:
         Returns:
             Dict mapping FK column name -> (target_schema, target_table)
         """
-        table_meta = self.introspector.get_table_metadata(schema, table)
+        key = (schema, table, frozenset(tables_with_remapped_ids))
+        cached = self._fk_remap_cache.get(key)
+        if cached is not None:
+            return cached
+
+        table_meta = self._get_table_metadata(schema, table)
         fk_to_remap = {}
 
         for fk in table_meta.foreign_keys_outgoing:
@@ -843,30 +1178,200 @@ class SQLGenerator:
             if target_key in tables_with_remapped_ids:
                 fk_to_remap[fk.source_column] = target_key
 
+        self._fk_remap_cache[key] = fk_to_remap
         return fk_to_remap
 
+    def _get_fk_remap_select_sql(
+        self,
+        schema: str,
+        table: str,
+        columns: list[str],
+        tables_with_remapped_ids: Set[tuple[str, str]],
+    ) -> tuple[str, str, str]:
+        """
+        Get the SELECT skeleton of an FK-remapping INSERT-SELECT, with caching.
+
+        The SELECT list (with type casts), the VALUES column aliases and the
+        _pgslice_id_map JOINs only depend on the table's columns and on which
+        referenced tables have remapped IDs, so every batch of a table reuses
+        them; only the VALUES rows are rebuilt per batch.
+
+        Args:
+            schema: Table schema
+            table: Table name
+            columns: Ordered insert columns
+            tables_with_remapped_ids: Set of (schema, table) tuples that have ID remapping
+
+        Returns:
+            (select_clause, data_aliases_sql, join_clause) tuple
+        """
+        key = (schema, table, tuple(columns), frozenset(tables_with_remapped_ids))
+        cached = self._fk_remap_select_cache.get(key)
+        if cached is not None:
+            return cached
+
+        fk_to_remap = self._get_fk_columns_to_remap(
+            schema, table, tables_with_remapped_ids
+        )
+
+        # Create column aliases for the VALUES clause
+        # Example: data("old_actor_id", "old_film_id", "description", "last_update")
+        data_column_aliases = []
+        for col in columns:
+            if col in fk_to_remap:
+                # Quote the prefixed alias for remapped FK columns
+                data_column_aliases.append(self._quote_identifier(f"old_{col}"))
+            else:
+                # Quote regular column names to handle reserved keywords
+                data_column_aliases.append(self._quote_identifier(col))
+
+        # Get table metadata for column types
+        table_meta = self._get_table_metadata(schema, table)
+
+        # Build SELECT clause and JOIN clauses
+        select_parts = []
+        join_clauses = []
+        join_index = 0
+
+        for col in columns:
+            if col in fk_to_remap:
+                # FK column: select from mapping table
+                target_schema, target_table = fk_to_remap[col]
+                target_full = f'"{target_schema}"."{target_table}"'
+                alias = f"map{join_index}"
+
+                # Get column data type for casting
+                col_meta = table_meta.columns_by_name.get(col)
+                if col_meta:
+                    col_type = col_meta.data_type
+                    # For user-defined types, use udt_name
+                    if col_type.upper() == "USER-DEFINED":
+                        col_type = col_meta.udt_name
+                else:
+                    col_type = "INTEGER"
+
+                select_parts.append(f"{alias}.new_id::{col_type}")
+
+                # Add JOIN clause
+                join_clauses.append(
+                    f"    JOIN _pgslice_id_map {alias}\n"
+                    f"        ON {alias}.table_name = '{target_full}'\n"
+                    f"        AND {alias}.old_id = data.{self._quote_identifier(f'old_{col}')}"
+                )
+                join_index += 1
+            else:
+                # Regular column: select from data with proper type casting
+                col_meta = table_meta.columns_by_name.get(col)
+                if col_meta:
+                    # Get the PostgreSQL type for casting
+                    # Map from information_schema data_type to PostgreSQL cast type
+                    pg_type = col_meta.data_type
+
+                    # For user-defined types (ENUMs, custom types), use udt_name
+                    if pg_type.upper() == "USER-DEFINED":
+                        pg_type = col_meta.udt_name
+                    # For arrays, use udt_name which includes the [] suffix properly
+                    elif pg_type.upper() == "ARRAY":
+                        # For arrays, we need to use the udt_name and convert to proper array type
+                        element_type = self._get_array_element_type(col_meta.udt_name)
+                        pg_type = f"{element_type}[]"
+
+                    select_parts.append(
+                        f"data.{self._quote_identifier(col)}::{pg_type}"
+                    )
+                else:
+                    # Fallback if column metadata not found
+                    select_parts.append(f"data.{self._quote_identifier(col)}")
+
+        select_sql = (
+            ",\n        ".join(select_parts),
+            ", ".join(data_column_aliases),
+            "\n".join(join_clauses),
+        )
+        self._fk_remap_select_cache[key] = select_sql
+        return select_sql
+
     def _serialize_pk_value(self, pk_values: tuple[Any, ...]) -> str:
         """
         Serialize PK value(s) to string for storage in temp table.
 
         Handles:
         - Single values: convert to string
-        - Composite PKs: JSON array
+        - Composite PKs: string values joined with COMPOSITE_PK_SEPARATOR,
+          with backslashes and separators inside a value backslash-escaped
         - UUIDs: string representation
 
         Examples:
             (123,) -> "123"
-            (1, 2) -> "[1, 2]"
+            (1, 2) -> "1|2"
+            ("a|b", "c") -> "a\\|b|c"
             (UUID("..."),) -> "uuid-string"
         """
         if len(pk_values) == 1:
-            val = pk_values[0]
-            if isinstance(val, UUID):
-                return str(val)
-            return str(val)
-        else:
-            # Composite PK: use JSON array
-            return json.dumps([str(v) for v in pk_values])
+            return str(pk_values[0])
+        # Composite PK: the value only has to be unique within _pgslice_id_map,
+        # so an escaped join is enough (no JSON encoding)
+        separator = self.COMPOSITE_PK_SEPARATOR
+        parts = []
+        for value in map(str, pk_values):
+            if "\\" in value or separator in value:
+                value = value.replace("\\", "\\\\").replace(separator, "\\" + separator)
+            parts.append(value)
+        return separator.join(parts)
+
+    def _serialize_old_pk_values(self, records: list[RecordData]) -> list[str]:
+        """
+        Serialize the original PK of every record for the id-map arrays.
+
+        RecordIdentifier already normalizes PK values to strings, so when
+        every record has a single-column PK the values are used as-is.
+
+        Args:
+            records: Records of a single table
+
+        Returns:
+            Serialized PK values, in record order
+        """
+        identifiers = [record.identifier for record in records]
+        if all(len(identifier.pk_values) == 1 for identifier in identifiers):
+            return [identifier.pk_values[0] for identifier in identifiers]
+        return [
+            self._serialize_pk_value(identifier.pk_values) for identifier in identifiers
+        ]
+
+    def _format_old_ids_array(self, old_pk_values: list[str]) -> str:
+        """
+        Format serialized PK values as the elements of a TEXT[] literal.
+
+        Example:
+            ["1", "2"] -> "'1', '2'"
+        """
+        return "'" + "', '".join(old_pk_values) + "'"
+
+    def _get_id_map_bulk_insert_lines(
+        self, full_table_name: str, table: str
+    ) -> list[str]:
+        """
+        Get the set-based statement storing a bulk insert's ID mappings.
+
+        Pairs v_old_ids_<table> with v_new_ids_<table> through a two-array
+        unnest() in one INSERT ... SELECT, instead of one INSERT per row in
+        a PL/pgSQL loop. Positions past the end of the new IDs (NULL) are
+        skipped, as the loop over the new IDs' length did.
+
+        Args:
+            full_table_name: Quoted "schema"."table" name stored in the map
+            table: Table name used in the PL/pgSQL variable names
+
+        Returns:
+            SQL lines, indented for the PL/pgSQL block
+        """
+        return [
+            "    INSERT INTO _pgslice_id_map",
+            f"    SELECT '{full_table_name}', ids.old_id, ids.new_id::TEXT",
+            f"    FROM unnest(v_old_ids_{table}, v_new_ids_{table}) AS ids(old_id, new_id)",
+            "    WHERE ids.new_id IS NOT NULL;",
+        ]
 
     def _build_fk_remapping_value(
         self,
@@ -979,7 +1484,7 @@ class SQLGenerator:
                 return natural_keys
 
         # Get table metadata
-        table_meta = self.introspector.get_table_metadata(schema, table)
+        table_meta = self._get_table_metadata(schema, table)
 
         # Filter to non-PK, non-nullable columns
         candidate_columns = [
@@ -987,7 +1492,7 @@ class SQLGenerator:
             for col in table_meta.columns
             if not col.is_primary_key
             and not col.nullable
-            and col.data_type in ("character varying", "text", "varchar")
+            and col.data_type in _NATURAL_KEY_DATA_TYPES
         ]
 
         if not candidate_columns:
@@ -995,22 +1500,10 @@ class SQLGenerator:
             return []
 
         # PRIORITY 2: Common unique column names (single column)
-        common_unique_names = {
-            "name",
-            "code",
-            "slug",
-            "email",
-            "username",
-            "key",
-            "identifier",
-            "handle",
-        }
-        common_unique_patterns = ["_code", "_key", "_identifier", "_slug"]
-
         for col in candidate_columns:
             col_lower = col.name.lower()
             # Exact match
-            if col_lower in common_unique_names:
+            if col_lower in _NATURAL_KEY_NAMES:
                 natural_keys = [col.name]
                 self._natural_key_cache[cache_key] = natural_keys
                 logger.info(
@@ -1020,15 +1513,17 @@ class SQLGenerator:
                 return natural_keys
 
             # Pattern match
-            for pattern in common_unique_patterns:
-                if col_lower.endswith(pattern):
-                    natural_keys = [col.name]
-                    self._natural_key_cache[cache_key] = natural_keys
-                    logger.info(
-                        f"Auto-detected natural key for {schema}.{table}: "
-                        f"{natural_keys} (pattern: *{pattern})"
-                    )
-                    return natural_keys
+            if col_lower.endswith(_NATURAL_KEY_SUFFIXES):
+                pattern = next(
+                    p for p in _NATURAL_KEY_SUFFIXES if col_lower.endswith(p)
+                )
+                natural_keys = [col.name]
+                self._natural_key_cache[cache_key] = natural_keys
+                logger.info(
+                    f"Auto-detected natural key for {schema}.{table}: "
+                    f"{natural_keys} (pattern: *{pattern})"
+                )
+                return natural_keys
 
         # PRIORITY 3: Reference table pattern
         # Table has 2-3 total columns with exactly ONE non-PK non-nullable VARCHAR
@@ -1078,19 +1573,42 @@ class SQLGenerator:
             - If on_conflict_sql != "": use traditional ON CONFLICT, natural_keys is None
             - If natural_keys is not None: use CTE pattern, on_conflict_sql is ""
             - Both empty: error case (should never happen, raises exception)
+
+        The result only depends on table metadata, so it is cached per
+        (schema, table, insert_columns, auto_gen_pks); errors are not cached.
         """
+        key = (schema, table, tuple(insert_columns), tuple(auto_gen_pks))
+        cached = self._on_conflict_cache.get(key)
+        if cached is None:
+            cached = self._compute_on_conflict_clause(
+                table_meta, insert_columns, auto_gen_pks, schema, table
+            )
+            self._on_conflict_cache[key] = cached
+        return cached
+
+    def _compute_on_conflict_clause(
+        self,
+        table_meta: Table,
+        insert_columns: list[str],
+        auto_gen_pks: list[str],
+        schema: str,
+        table: str,
+    ) -> tuple[str, list[str] | None]:
+        """Uncached body of _build_on_conflict_clause (same arguments)."""
+        # Column classification shared by every priority check below
+        insert_column_set = set(insert_columns)
+        auto_gen_pk_set = set(auto_gen_pks)
+
         # PRIORITY 1: Check for non-auto-generated primary keys
         # These are string PKs, UUIDs, or manually-set integer PKs
         if table_meta.primary_keys:
             # Get PKs that are NOT auto-generated
             non_auto_gen_pks = [
-                pk for pk in table_meta.primary_keys if pk not in auto_gen_pks
+                pk for pk in table_meta.primary_keys if pk not in auto_gen_pk_set
             ]
 
             # Verify all PK columns are being inserted
-            if non_auto_gen_pks and all(
-                pk in insert_columns for pk in non_auto_gen_pks
-            ):
+            if non_auto_gen_pks and insert_column_set.issuperset(non_auto_gen_pks):
                 conflict_cols = ", ".join(f'"{pk}"' for pk in non_auto_gen_pks)
                 # Use first PK for no-op update
                 update_col = non_auto_gen_pks[0]
@@ -1101,37 +1619,36 @@ class SQLGenerator:
                 return (on_conflict, None)
 
         # PRIORITY 2: Check for unique constraints (existing logic)
-        unique_constraints = table_meta.unique_constraints
-
-        # Filter out unique constraints that only contain auto-generated PKs
-        # (those are already handled by the PK constraint)
-        non_pk_unique = {
-            name: cols
-            for name, cols in unique_constraints.items()
-            if not all(c in auto_gen_pks for c in cols)
-        }
-
-        if non_pk_unique:
-            # Use the first unique constraint for ON CONFLICT
-            # (could be improved to choose best constraint, but any will work)
-            constraint_name, constraint_cols = next(iter(non_pk_unique.items()))
-
-            # Check if all constraint columns are in insert_columns
-            if all(col in insert_columns for col in constraint_cols):
-                conflict_cols = ", ".join(f'"{col}"' for col in constraint_cols)
-
-                # Generate no-op UPDATE clause
-                # Pick the first column in the constraint for the update
-                update_col = constraint_cols[0]
-                on_conflict = (
-                    f"ON CONFLICT ({conflict_cols}) "
-                    f'DO UPDATE SET "{update_col}" = EXCLUDED."{update_col}"'
-                )
-                return (on_conflict, None)
+        # Use the first unique constraint for ON CONFLICT, skipping those that
+        # only contain auto-generated PKs (already handled by the PK constraint)
+        # (could be improved to choose best constraint, but any will work)
+        constraint_cols = next(
+            (
+                cols
+                for cols in table_meta.unique_constraints.values()
+                if not auto_gen_pk_set.issuperset(cols)
+            ),
+            None,
+        )
+
+        # Check if all constraint columns are in insert_columns
+        if constraint_cols is not None and insert_column_set.issuperset(
+            constraint_cols
+        ):
+            conflict_cols = ", ".join(f'"{col}"' for col in constraint_cols)
+
+            # Generate no-op UPDATE clause
+            # Pick the first column in the constraint for the update
+            update_col = constraint_cols[0]
+            on_conflict = (
+                f"ON CONFLICT ({conflict_cols}) "
+                f'DO UPDATE SET "{update_col}" = EXCLUDED."{update_col}"'
+            )
+            return (on_conflict, None)
 
         # PRIORITY 3: Natural key detection
         natural_keys = self._detect_natural_keys(schema, table)
-        if natural_keys and all(nk in insert_columns for nk in natural_keys):
+        if natural_keys and insert_column_set.issuperset(natural_keys):
             return ("", natural_keys)
 
         # PRIORITY 4: No idempotency available - ERROR
@@ -1147,7 +1664,7 @@ class SQLGenerator:
         """Generate INSERT with RETURNING and store ID mappings, with ON CONFLICT support."""
         # Get auto-generated PK columns
         auto_gen_pks = self._get_auto_generated_pk_columns(schema, table)
-        table_meta = self.introspector.get_table_metadata(schema, table)
+        table_meta = self._get_table_metadata(schema, table)
 
         # Get all columns EXCEPT auto-generated PKs
         first_record = records[0]
@@ -1155,29 +1672,7 @@ class SQLGenerator:
         insert_columns = [col for col in all_columns if col not in auto_gen_pks]
 
         # Build column list
-        columns_sql = ", ".join(f'"{col}"' for col in insert_columns)
-
-        # Get column type mapping for array/JSON distinction
-        column_type_map = self._get_column_types(schema, table)
-
-        # Build VALUES rows
-        values_rows = []
-        old_pk_values = []
-        for record in records:
-            values = [
-                self._format_value(record.data.get(col), column_type_map.get(col))
-                for col in insert_columns
-            ]
-            values_sql = ", ".join(values)
-            values_rows.append(f"        ({values_sql})")
-
-            # Store old PK value for mapping
-            # Get the PK values from the record identifier
-            old_pks = record.identifier.pk_values
-            old_pk_values.append(self._serialize_pk_value(old_pks))
-
-        values_clause = ",\n".join(values_rows)
-        full_table_name = f'"{schema}"."{table}"'
+        columns_sql = self._get_column_list_sql(insert_columns)
 
         # Build ON CONFLICT clause for unique constraints (or detect natural keys)
         on_conflict, natural_keys = self._build_on_conflict_clause(
@@ -1194,13 +1689,20 @@ class SQLGenerator:
                 schema, table, records, natural_keys, auto_gen_pks
             )
 
+        # Build VALUES rows and the old PK values for mapping
+        value_lines = self._get_values_lines(
+            self._format_rows(schema, table, insert_columns, records)
+        )
+        old_pk_values = self._serialize_old_pk_values(records)
+        full_table_name = f'"{schema}"."{table}"'
+
         # Use traditional ON CONFLICT approach
         if len(records) == 1:
             # Single insert: use RETURNING INTO scalar variable
             sql_lines = [
                 f"    INSERT INTO {full_table_name} ({columns_sql})",
                 "    VALUES",
-                f"{values_clause}",
+                *value_lines,
             ]
             if on_conflict:
                 sql_lines.append(f"    {on_conflict}")
@@ -1212,13 +1714,13 @@ class SQLGenerator:
             )
         else:
             # Bulk insert: use WITH + array aggregation + loop
-            old_ids_array = ", ".join(f"'{val}'" for val in old_pk_values)
+            old_ids_array = self._format_old_ids_array(old_pk_values)
             sql_lines = [
                 f"    v_old_ids_{table} := ARRAY[{old_ids_array}];",
                 "    WITH inserted AS (",
                 f"        INSERT INTO {full_table_name} ({columns_sql})",
                 "        VALUES",
-                f"{values_clause}",
+                *value_lines,
             ]
             if on_conflict:
                 sql_lines.append(f"        {on_conflict}")
@@ -1228,9 +1730,7 @@ class SQLGenerator:
                     "    )",
                     f"    SELECT array_agg({auto_gen_pks[0]}) INTO v_new_ids_{table} FROM inserted;",
                     "    ",
-                    f"    FOR i IN 1..array_length(v_new_ids_{table}, 1) LOOP",
-                    f"        INSERT INTO _pgslice_id_map VALUES ('{full_table_name}', v_old_ids_{table}[i], v_new_ids_{table}[i]::TEXT);",
-                    "    END LOOP;",
+                    *self._get_id_map_bulk_insert_lines(full_table_name, table),
                 ]
             )
 
@@ -1289,27 +1789,14 @@ class SQLGenerator:
             )
 
         # Build column list
-        columns_sql = ", ".join(f'"{col}"' for col in insert_columns)
+        columns_sql = self._get_column_list_sql(insert_columns)
         natural_keys_sql = ", ".join(f'"{nk}"' for nk in natural_keys)
 
-        # Get column type mapping
-        column_type_map = self._get_column_types(schema, table)
-
         # Build VALUES rows and collect old PK values
-        values_rows = []
-        old_pk_values = []
-        for record in records:
-            values = [
-                self._format_value(record.data.get(col), column_type_map.get(col))
-                for col in insert_columns
-            ]
-            values_sql = ", ".join(values)
-            values_rows.append(f"        ({values_sql})")
-
-            old_pks = record.identifier.pk_values
-            old_pk_values.append(self._serialize_pk_value(old_pks))
-
-        values_clause = ",\n".join(values_rows)
+        value_lines = self._get_values_lines(
+            self._format_rows(schema, table, insert_columns, records)
+        )
+        old_pk_values = self._serialize_old_pk_values(records)
         full_table_name = f'"{schema}"."{table}"'
         pk_col = auto_gen_pks[0]  # Use first PK column
 
@@ -1321,7 +1808,7 @@ class SQLGenerator:
             natural_keys, "ins", "ti"
         )
 
-        old_ids_array = ", ".join(f"'{val}'" for val in old_pk_values)
+        old_ids_array = self._format_old_ids_array(old_pk_values)
 
         # Generate CTE-based INSERT
         sql_lines = [
@@ -1331,7 +1818,7 @@ class SQLGenerator:
             f"            unnest(v_old_ids_{table}) AS old_id,",
             "            *",
             "        FROM (VALUES",
-            f"{values_clause}",
+            *value_lines,
             f"        ) AS data({columns_sql})",
             "    ),",
             "    existing AS (",
@@ -1361,9 +1848,7 @@ class SQLGenerator:
             f"    SELECT array_agg(new_id ORDER BY old_id) INTO v_new_ids_{table}",
             "    FROM all_ids;",
             "    ",
-            f"    FOR i IN 1..array_length(v_new_ids_{table}, 1) LOOP",
-            f"        INSERT INTO _pgslice_id_map VALUES ('{full_table_name}', v_old_ids_{table}[i], v_new_ids_{table}[i]::TEXT);",
-            "    END LOOP;",
+            *self._get_id_map_bulk_insert_lines(full_table_name, table),
         ]
 
         return "\n".join(sql_lines)
@@ -1373,7 +1858,7 @@ class SQLGenerator:
         schema: str,
         table: str,
         records: list[RecordData],
-        tables_with_remapped_ids: set[tuple[str, str]],
+        tables_with_remapped_ids: Set[tuple[str, str]],
     ) -> str:
         """
         Generate INSERT with FK remapping using JOIN-based approach.
@@ -1413,29 +1898,17 @@ class SQLGenerator:
         else:
             columns = all_columns
 
-        # Get column type mapping for array/JSON distinction
-        column_type_map = self._get_column_types(schema, table)
-
         full_table_name = f'"{schema}"."{table}"'
 
         # If no FKs to remap, use simple INSERT VALUES
         if not fk_to_remap:
-            columns_sql = ", ".join(f'"{col}"' for col in columns)
-            values_rows = []
-            for record in records:
-                values = []
-                for col in columns:
-                    values.append(
-                        self._format_value(
-                            record.data.get(col), column_type_map.get(col)
-                        )
-                    )
-                values_sql = ", ".join(values)
-                values_rows.append(f"        ({values_sql})")
-            values_clause = ",\n".join(values_rows)
+            columns_sql = self._get_column_list_sql(columns)
+            value_lines = self._get_values_lines(
+                self._format_rows(schema, table, columns, records)
+            )
 
             # Build ON CONFLICT clause for idempotency (or detect natural keys)
-            table_meta = self.introspector.get_table_metadata(schema, table)
+            table_meta = self._get_table_metadata(schema, table)
             on_conflict, natural_keys = self._build_on_conflict_clause(
                 table_meta, columns, auto_gen_pks, schema, table
             )
@@ -1452,7 +1925,7 @@ class SQLGenerator:
             sql_parts = [
                 f"    INSERT INTO {full_table_name} ({columns_sql})",
                 "    VALUES",
-                f"{values_clause}",
+                *value_lines,
             ]
             if on_conflict:
                 sql_parts.append(f"    {on_conflict}")
@@ -1460,125 +1933,40 @@ class SQLGenerator:
 
             return "\n".join(sql_parts)
 
-        # Build VALUES clause with old FK values as strings
-        values_rows = []
-        old_pk_values = []  # Track old PK values for mapping (if has_auto_gen_pks)
-
-        for record in records:
-            values = []
-            for col in columns:
-                value = record.data.get(col)
-                if col in fk_to_remap:
-                    # For FK columns, use old ID as string
-                    if value is None:
-                        values.append("NULL")
-                    else:
-                        # Escape single quotes in the value
-                        escaped_value = str(value).replace("'", "''")
-                        values.append(f"'{escaped_value}'")
-                else:
-                    # For regular columns, format normally
-                    values.append(self._format_value(value, column_type_map.get(col)))
-            values_sql = ", ".join(values)
-            values_rows.append(f"        ({values_sql})")
-
-            # Track old PK values for mapping (if has auto-gen PKs)
-            if has_auto_gen_pks:
-                old_pks = record.identifier.pk_values
-                old_pk_values.append(self._serialize_pk_value(old_pks))
-
-        values_clause = ",\n".join(values_rows)
-
-        # Create column aliases for the VALUES clause
-        # Example: data("old_actor_id", "old_film_id", "description", "last_update")
-        data_column_aliases = []
-        for col in columns:
-            if col in fk_to_remap:
-                # Quote the prefixed alias for remapped FK columns
-                data_column_aliases.append(self._quote_identifier(f"old_{col}"))
-            else:
-                # Quote regular column names to handle reserved keywords
-                data_column_aliases.append(self._quote_identifier(col))
-
-        # Get table metadata for column types
-        table_meta = self.introspector.get_table_metadata(schema, table)
-
-        # Build SELECT clause and JOIN clauses
-        select_parts = []
-        join_clauses = []
-        join_index = 0
-
-        for col in columns:
-            if col in fk_to_remap:
-                # FK column: select from mapping table
-                target_schema, target_table = fk_to_remap[col]
-                target_full = f'"{target_schema}"."{target_table}"'
-                alias = f"map{join_index}"
-
-                # Get column data type for casting
-                col_meta = next((c for c in table_meta.columns if c.name == col), None)
-                if col_meta:
-                    col_type = col_meta.data_type
-                    # For user-defined types, use udt_name
-                    if col_type.upper() == "USER-DEFINED":
-                        col_type = col_meta.udt_name
-                else:
-                    col_type = "INTEGER"
-
-                select_parts.append(f"{alias}.new_id::{col_type}")
-
-                # Add JOIN clause
-                join_clauses.append(
-                    f"    JOIN _pgslice_id_map {alias}\n"
-                    f"        ON {alias}.table_name = '{target_full}'\n"
-                    f"        AND {alias}.old_id = data.{self._quote_identifier(f'old_{col}')}"
-                )
-                join_index += 1
-            else:
-                # Regular column: select from data with proper type casting
-                col_meta = next((c for c in table_meta.columns if c.name == col), None)
-                if col_meta:
-                    # Get the PostgreSQL type for casting
-                    # Map from information_schema data_type to PostgreSQL cast type
-                    pg_type = col_meta.data_type
-
-                    # For user-defined types (ENUMs, custom types), use udt_name
-                    if pg_type.upper() == "USER-DEFINED":
-                        pg_type = col_meta.udt_name
-                    # For arrays, use udt_name which includes the [] suffix properly
-                    elif pg_type.upper() == "ARRAY":
-                        # For arrays, we need to use the udt_name and convert to proper array type
-                        element_type = self._get_array_element_type(col_meta.udt_name)
-                        pg_type = f"{element_type}[]"
+        # Build VALUES rows with old FK values as strings
+        value_lines = self._get_values_lines(
+            self._format_rows(schema, table, columns, records, frozenset(fk_to_remap))
+        )
 
-                    select_parts.append(
-                        f"data.{self._quote_identifier(col)}::{pg_type}"
-                    )
-                else:
-                    # Fallback if column metadata not found
-                    select_parts.append(f"data.{self._quote_identifier(col)}")
+        # Track old PK values for mapping (if has auto-gen PKs)
+        old_pk_values = (
+            self._serialize_old_pk_values(records) if has_auto_gen_pks else []
+        )
 
-        select_clause = ",\n        ".join(select_parts)
-        join_clause = "\n".join(join_clauses)
+        # SELECT list, VALUES aliases and JOINs only depend on the columns
+        select_clause, data_aliases_sql, join_clause = self._get_fk_remap_select_sql(
+            schema, table, columns, tables_with_remapped_ids
+        )
 
         # Build final INSERT-SELECT statement
-        columns_sql = ", ".join(f'"{col}"' for col in columns)
-        data_aliases_sql = ", ".join(data_column_aliases)
+        columns_sql = self._get_column_list_sql(columns)
 
-        # Base INSERT-SELECT statement
-        base_sql_lines = [
+        # Base INSERT-SELECT statement, around the VALUES rows. The rows are
+        # spliced into the final line list so only its join copies them.
+        head_sql_lines = [
             f"    INSERT INTO {full_table_name} ({columns_sql})",
             "    SELECT",
             f"        {select_clause}",
             "    FROM (VALUES",
-            f"{values_clause}",
+        ]
+        tail_sql_lines = [
             f"    ) AS data({data_aliases_sql})",
-            f"{join_clause}",
+            join_clause,
         ]
 
         # If table has auto-generated PKs, add RETURNING and mapping storage
         if has_auto_gen_pks:
-            table_meta = self.introspector.get_table_metadata(schema, table)
+            table_meta = self._get_table_metadata(schema, table)
 
             # Build ON CONFLICT clause for idempotency (or detect natural keys)
             on_conflict, natural_keys = self._build_on_conflict_clause(
@@ -1595,9 +1983,7 @@ class SQLGenerator:
 
             if len(records) == 1:
                 # Single insert: use RETURNING INTO scalar variable
-                sql_lines = base_sql_lines.copy()
-                # Remove the semicolon from the last line (join_clause)
-                sql_lines[-1] = sql_lines[-1].rstrip(";")
+                sql_lines = [*head_sql_lines, *value_lines, *tail_sql_lines]
                 if on_conflict:
                     sql_lines.append(f"    {on_conflict}")
                 sql_lines.extend(
@@ -1609,16 +1995,17 @@ class SQLGenerator:
                 return "\n".join(sql_lines)
             else:
                 # Bulk insert: wrap in WITH clause + array aggregation
-                old_ids_array = ", ".join(f"'{val}'" for val in old_pk_values)
+                old_ids_array = self._format_old_ids_array(old_pk_values)
+                # Indent base SQL by 4 more spaces (the VALUES rows start on
+                # the same line, so only the first of them is shifted)
                 sql_lines = [
                     f"    v_old_ids_{table} := ARRAY[{old_ids_array}];",
                     "    WITH inserted AS (",
+                    *[f"    {line}" for line in head_sql_lines],
+                    f"    {value_lines[0]}",
+                    *value_lines[1:],
+                    *[f"    {line}" for line in tail_sql_lines],
                 ]
-                # Indent base SQL by 4 more spaces
-                for line in base_sql_lines:
-                    # Remove the semicolon from join_clause line
-                    line = line.rstrip(";")
-                    sql_lines.append(f"    {line}")
                 if on_conflict:
                     sql_lines.append(f"        {on_conflict}")
                 sql_lines.extend(
@@ -1627,15 +2014,13 @@ class SQLGenerator:
                         "    )",
                         f"    SELECT array_agg({auto_gen_pks[0]}) INTO v_new_ids_{table} FROM inserted;",
                         "    ",
-                        f"    FOR i IN 1..array_length(v_new_ids_{table}, 1) LOOP",
-                        f"        INSERT INTO _pgslice_id_map VALUES ('{full_table_name}', v_old_ids_{table}[i], v_new_ids_{table}[i]::TEXT);",
-                        "    END LOOP;",
+                        *self._get_id_map_bulk_insert_lines(full_table_name, table),
                     ]
                 )
                 return "\n".join(sql_lines)
         else:
             # No auto-gen PKs: return simple INSERT-SELECT with ON CONFLICT
-            table_meta = self.introspector.get_table_metadata(schema, table)
+            table_meta = self._get_table_metadata(schema, table)
 
             # Build ON CONFLICT clause for idempotency (or detect natural keys)
             on_conflict, natural_keys = self._build_on_conflict_clause(
@@ -1650,9 +2035,7 @@ class SQLGenerator:
                     f"Attempting ON CONFLICT fallback (may fail)."
                 )
 
-            sql_lines = base_sql_lines.copy()
-            # Remove trailing semicolon if present
-            sql_lines[-1] = sql_lines[-1].rstrip(";")
+            sql_lines = [*head_sql_lines, *value_lines, *tail_sql_lines]
             if on_conflict:
                 sql_lines.append(f"    {on_conflict}")
             # Add semicolon at the end
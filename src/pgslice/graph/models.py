@@ -33,7 +33,7 @@ class ColumnType(Enum):
     OTHER = "other"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Column:
     """Represents a database column."""
 
@@ -46,7 +46,7 @@ class Column:
     is_auto_generated: bool = False  # True for SERIAL, BIGSERIAL, IDENTITY columns
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ForeignKey:
     """Represents a foreign key relationship."""
 
@@ -69,8 +69,22 @@ class ForeignKey:
         )
 
 
-@dataclass
-class Table:
+class _TableColumnIndex:
+    """
+    Slot for Table's lazily built column index.
+
+    Kept on a base class so the cache is not a dataclass field: it stays out
+    of fields(), asdict(), replace(), equality and pickles.
+    """
+
+    __slots__ = ("_columns_index",)
+
+    # The columns snapshot the index was built from, and the index itself
+    _columns_index: tuple[tuple[Column, ...], dict[str, Column]]
+
+
+@dataclass(slots=True)
+class Table(_TableColumnIndex):
     """Represents a database table with complete metadata."""
 
     schema_name: str
@@ -83,19 +97,45 @@ class Table:
         default_factory=dict
     )  # Constraint name -> column names
 
+    @property
+    def columns_by_name(self) -> dict[str, Column]:
+        """
+        Get columns keyed by name.
+
+        The mapping is built on first use and rebuilt whenever ``columns``
+        no longer holds the same columns, whether it was reassigned or
+        changed in place.
+        """
+        columns = tuple(self.columns)
+        try:
+            snapshot, index = self._columns_index
+        except AttributeError:
+            snapshot, index = (), {}
+        if snapshot != columns:
+            index = {col.name: col for col in columns}
+            # The slot lives on the base class, which mypy does not see here
+            object.__setattr__(self, "_columns_index", (columns, index))
+        return index
+
     @property
     def full_name(self) -> str:
         """Get fully qualified table name."""
         return f"{self.schema_name}.{self.table_name}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RecordIdentifier:
     """Uniquely identifies a database record by table and primary key(s)."""
 
     table_name: str
     schema_name: str
     pk_values: tuple[Any, ...]  # Support composite primary keys
+    # Hash of the normalized fields, computed once: identifiers are probed
+    # in sets and dicts far more often than they are created
+    _hash: int = field(init=False, repr=False, compare=False)
+    # repr is built on first use and kept: identifiers are formatted into
+    # log messages repeatedly, but most are never formatted at all
+    _repr: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Normalize pk_values to strings for consistent equality."""
@@ -103,10 +143,22 @@ class RecordIdentifier:
         normalized = tuple(str(v) for v in self.pk_values)
         # Use object.__setattr__ because dataclass is frozen
         object.__setattr__(self, "pk_values", normalized)
+        object.__setattr__(
+            self, "_hash", hash((self.schema_name, self.table_name, normalized))
+        )
 
     def __hash__(self) -> int:
         """Make hashable for use in sets (visited tracking)."""
-        return hash((self.schema_name, self.table_name, self.pk_values))
+        return self._hash
+
+    def __reduce__(self) -> tuple[type[RecordIdentifier], tuple[Any, ...]]:
+        """
+        Pickle by field values only.
+
+        The cached hash depends on the interpreter's hash seed, so it is
+        recomputed by __post_init__ on load instead of being restored.
+        """
+        return (RecordIdentifier, (self.table_name, self.schema_name, self.pk_values))
 
     def __eq__(self, other: object) -> bool:
         """Equality comparison for visited tracking."""
@@ -120,13 +172,23 @@ class RecordIdentifier:
 
     def __repr__(self) -> str:
         """String representation."""
-        pk_str = ", ".join(str(v) for v in self.pk_values)
-        return f"{self.schema_name}.{self.table_name}({pk_str})"
+        repr_str = self._repr
+        if repr_str is None:
+            pk_str = ", ".join(self.pk_values)
+            repr_str = f"{self.schema_name}.{self.table_name}({pk_str})"
+            object.__setattr__(self, "_repr", repr_str)
+        return repr_str
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class RecordData:
-    """Contains actual record data with dependency information."""
+    """
+    Contains actual record data with dependency information.
+
+    Identity is the record identifier alone: hashing and equality never look
+    at ``data`` or ``dependencies``, so set membership costs one identifier
+    hash regardless of row width.
+    """
 
     identifier: RecordIdentifier
     data: dict[str, Any]
@@ -140,7 +202,10 @@ class RecordData:
         """Equality based on identifier."""
         if not isinstance(other, RecordData):
             return NotImplemented
-        return self.identifier == other.identifier
+        # Records built from the same traversal usually share the identifier
+        return (
+            self.identifier is other.identifier or self.identifier == other.identifier
+        )
 
 
 @dataclass
@@ -51,6 +51,9 @@ class RelationshipTraverser:
         self.introspector = schema_introspector
         self.visited = visited_tracker
         self.table_cache: dict[str, Table] = {}
+        # Parsed FK table names; identifiers built from the same FK share
+        # one pair of schema/table strings instead of a fresh split each
+        self._table_name_cache: dict[str, tuple[str, str]] = {}
         self.timeframe_filters = {f.table_name: f for f in (timeframe_filters or [])}
         self.wide_mode = wide_mode
         self.fetch_batch_size = fetch_batch_size
@@ -298,8 +301,7 @@ class RelationshipTraverser:
             return results
 
         # Step 3: Mark all starting records as visited BEFORE fetching
-        for rid in unvisited_start_ids:
-            self.visited.mark_visited(rid)
+        self.visited.mark_visited_many(unvisited_start_ids)
 
         # Step 4: Batch-fetch ALL starting records in one query
         try:
@@ -850,7 +852,12 @@ class RelationshipTraverser:
         Returns:
             Tuple of (schema, table)
         """
-        if "." in full_name:
-            parts = full_name.split(".", 1)
-            return parts[0], parts[1]
-        return "public", full_name
+        parsed = self._table_name_cache.get(full_name)
+        if parsed is None:
+            if "." in full_name:
+                schema, table = full_name.split(".", 1)
+                parsed = (schema, table)
+            else:
+                parsed = ("public", full_name)
+            self._table_name_cache[full_name] = parsed
+        return parsed
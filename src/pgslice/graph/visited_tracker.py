@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from ..graph.models import RecordIdentifier
 
 
@@ -33,6 +35,15 @@ class VisitedTracker:
         """
         self._visited.add(record_id)
 
+    def mark_visited_many(self, record_ids: Iterable[RecordIdentifier]) -> None:
+        """
+        Mark several records as visited in one set update.
+
+        Args:
+            record_ids: Record identifiers to mark as visited
+        """
+        self._visited.update(record_ids)
+
     def reset(self) -> None:
         """Clear all visited records."""
         self._visited.clear()
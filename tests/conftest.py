@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import os
 import tempfile
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from datetime import datetime
 from typing import Any
 from unittest.mock import MagicMock
@@ -94,9 +94,11 @@ def sample_cache_config(tmp_path: Any) -> CacheConfig:
 # =============================================================================
 # Model Fixtures
 # =============================================================================
+# Frozen models are shared for the whole session; mutable ones (Table,
+# RecordData) are rebuilt per test.
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_column() -> Column:
     """Provide a sample Column model."""
     return Column(
@@ -110,7 +112,7 @@ def sample_column() -> Column:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_foreign_key() -> ForeignKey:
     """Provide a sample ForeignKey model."""
     return ForeignKey(
@@ -185,7 +187,7 @@ def sample_users_table() -> Table:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_record_identifier() -> RecordIdentifier:
     """Provide a sample RecordIdentifier."""
     return RecordIdentifier(
@@ -287,6 +289,48 @@ def mock_schema_introspector(mocker: Any, sample_table: Table) -> MagicMock:
 # =============================================================================
 
 
+@pytest.fixture
+def make_record() -> Callable[..., RecordData]:
+    """
+    Provide a RecordData factory for dependency tests.
+
+    Identifiers are memoized by (schema, table, pk) so records built for the
+    same key share one RecordIdentifier instance.
+
+    Usage:
+        base = make_record("base", 1)
+        child = make_record("child", 2, base)  # child depends on base
+    """
+    identifiers: dict[tuple[str, str, Any], RecordIdentifier] = {}
+
+    def _make(
+        table_name: str,
+        pk: Any,
+        *depends_on: RecordData | RecordIdentifier,
+        schema_name: str = "public",
+        data: dict[str, Any] | None = None,
+    ) -> RecordData:
+        key = (schema_name, table_name, pk)
+        identifier = identifiers.get(key)
+        if identifier is None:
+            identifier = RecordIdentifier(
+                schema_name=schema_name,
+                table_name=table_name,
+                pk_values=(pk,),
+            )
+            identifiers[key] = identifier
+        return RecordData(
+            identifier=identifier,
+            data=data if data is not None else {"id": pk},
+            dependencies={
+                dep.identifier if isinstance(dep, RecordData) else dep
+                for dep in depends_on
+            },
+        )
+
+    return _make
+
+
 @pytest.fixture
 def record_chain() -> list[RecordData]:
     """
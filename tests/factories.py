@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -16,7 +17,11 @@ from pgslice.graph.models import (
     TimeframeFilter,
 )
 
-fake = Faker()
+
+@functools.cache
+def _faker() -> Faker:
+    """Build the shared Faker instance on first use."""
+    return Faker()
 
 
 class ColumnFactory:
@@ -34,7 +39,7 @@ class ColumnFactory:
     ) -> Column:
         """Create a Column with configurable attributes."""
         return Column(
-            name=name or fake.word(),
+            name=name or _faker().word(),
             data_type=data_type,
             udt_name=udt_name,
             nullable=nullable,
@@ -59,7 +64,7 @@ class ColumnFactory:
     def create_text(name: str | None = None, nullable: bool = True) -> Column:
         """Create a text column."""
         return Column(
-            name=name or fake.word(),
+            name=name or _faker().word(),
             data_type="text",
             udt_name="text",
             nullable=nullable,
@@ -100,8 +105,8 @@ class ForeignKeyFactory:
         on_delete: str = "NO ACTION",
     ) -> ForeignKey:
         """Create a ForeignKey with configurable attributes."""
-        src_table = source_table or fake.word()
-        tgt_table = target_table or fake.word()
+        src_table = source_table or _faker().word()
+        tgt_table = target_table or _faker().word()
         src_col = source_column or f"{tgt_table}_id"
 
         return ForeignKey(
@@ -144,7 +149,7 @@ class TableFactory:
         unique_constraints: dict[str, list[str]] | None = None,
     ) -> Table:
         """Create a Table with configurable attributes."""
-        name = table_name or fake.word()
+        name = table_name or _faker().word()
 
         if columns is None:
             columns = [
@@ -225,9 +230,9 @@ class RecordIdentifierFactory:
     ) -> RecordIdentifier:
         """Create a RecordIdentifier with configurable attributes."""
         return RecordIdentifier(
-            table_name=table_name or fake.word(),
+            table_name=table_name or _faker().word(),
             schema_name=schema_name,
-            pk_values=pk_values or (fake.random_int(min=1, max=10000),),
+            pk_values=pk_values or (_faker().random_int(min=1, max=10000),),
         )
 
 
@@ -247,8 +252,8 @@ class RecordDataFactory:
         if data is None:
             data = {
                 "id": identifier.pk_values[0],
-                "name": fake.name(),
-                "email": fake.email(),
+                "name": _faker().name(),
+                "email": _faker().email(),
             }
 
         return RecordData(
@@ -295,7 +300,7 @@ class TimeframeFilterFactory:
             end_date = datetime.now()
 
         return TimeframeFilter(
-            table_name=table_name or fake.word(),
+            table_name=table_name or _faker().word(),
             column_name=column_name,
             start_date=start_date,
             end_date=end_date,
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+
 import pytest
 
 from pgslice.dumper.dependency_sorter import DependencySorter
-from pgslice.graph.models import RecordData, RecordIdentifier
+from pgslice.graph.models import RecordData
 from pgslice.utils.exceptions import CircularDependencyError
 
+MakeRecord = Callable[..., RecordData]
+
 
 class TestDependencySorter:
     """Tests for DependencySorter class."""
@@ -26,17 +30,11 @@ class TestSort(TestDependencySorter):
         result = sorter.sort(set())
         assert result == []
 
-    def test_single_record_no_dependencies(self, sorter: DependencySorter) -> None:
+    def test_single_record_no_dependencies(
+        self, sorter: DependencySorter, make_record: MakeRecord
+    ) -> None:
         """Single record with no dependencies should be returned as-is."""
-        record = RecordData(
-            identifier=RecordIdentifier(
-                schema_name="public",
-                table_name="users",
-                pk_values=(1,),
-            ),
-            data={"id": 1},
-            dependencies=set(),
-        )
+        record = make_record("users", 1)
         result = sorter.sort({record})
         assert len(result) == 1
         assert result[0] == record
@@ -94,96 +92,53 @@ class TestSort(TestDependencySorter):
         assert b_idx < a_idx
         assert c_idx < a_idx
 
-    def test_circular_dependency_raises_error(self, sorter: DependencySorter) -> None:
+    def test_circular_dependency_raises_error(
+        self, sorter: DependencySorter, make_record: MakeRecord
+    ) -> None:
         """Circular dependencies should raise CircularDependencyError."""
         # Create circular: A -> B -> A
-        id_a = RecordIdentifier(
-            schema_name="public",
-            table_name="table_a",
-            pk_values=(1,),
-        )
-        id_b = RecordIdentifier(
-            schema_name="public",
-            table_name="table_b",
-            pk_values=(2,),
-        )
-
-        record_a = RecordData(
-            identifier=id_a,
-            data={"id": 1},
-            dependencies={id_b},
-        )
-        record_b = RecordData(
-            identifier=id_b,
-            data={"id": 2},
-            dependencies={id_a},
-        )
+        id_b = make_record("table_b", 2).identifier
+        record_a = make_record("table_a", 1, id_b)
+        record_b = make_record("table_b", 2, record_a)
 
         with pytest.raises(CircularDependencyError, match="Circular dependency"):
             sorter.sort({record_a, record_b})
 
     def test_self_referencing_dependency_raises_error(
-        self, sorter: DependencySorter
+        self, sorter: DependencySorter, make_record: MakeRecord
     ) -> None:
         """Self-referencing dependency should raise CircularDependencyError."""
-        id_a = RecordIdentifier(
-            schema_name="public",
-            table_name="self_ref",
-            pk_values=(1,),
-        )
-
-        record_a = RecordData(
-            identifier=id_a,
-            data={"id": 1},
-            dependencies={id_a},  # Self-reference
-        )
+        id_a = make_record("self_ref", 1).identifier
+        record_a = make_record("self_ref", 1, id_a)  # Self-reference
 
         with pytest.raises(CircularDependencyError):
             sorter.sort({record_a})
 
-    def test_multiple_independent_records(self, sorter: DependencySorter) -> None:
+    def test_multiple_independent_records(
+        self, sorter: DependencySorter, make_record: MakeRecord
+    ) -> None:
         """Records with no dependencies between them can be in any order."""
-        records = set()
-        for i in range(5):
-            records.add(
-                RecordData(
-                    identifier=RecordIdentifier(
-                        schema_name="public",
-                        table_name=f"table_{i}",
-                        pk_values=(i,),
-                    ),
-                    data={"id": i},
-                    dependencies=set(),
-                )
-            )
+        records = {make_record(f"table_{i}", i) for i in range(5)}
 
         result = sorter.sort(records)
         assert len(result) == 5
         # All records should be in result
         assert set(result) == records
 
-    def test_external_dependencies_ignored(self, sorter: DependencySorter) -> None:
+    def test_external_dependencies_ignored(
+        self, sorter: DependencySorter, make_record: MakeRecord
+    ) -> None:
         """Dependencies to records not in the set should be ignored."""
-        external_id = RecordIdentifier(
-            schema_name="public",
-            table_name="external",
-            pk_values=(999,),
-        )
-        record = RecordData(
-            identifier=RecordIdentifier(
-                schema_name="public",
-                table_name="internal",
-                pk_values=(1,),
-            ),
-            data={"id": 1},
-            dependencies={external_id},  # External dependency
-        )
+        external = make_record("external", 999)
+        record = make_record("internal", 1, external)  # External dependency
 
         result = sorter.sort({record})
         assert len(result) == 1
         assert result[0] == record
 
-    def test_complex_dependency_graph(self, sorter: DependencySorter) -> None:
+    def test_complex_dependency_graph(
+        self, sorter: DependencySorter, make_record: MakeRecord
+    ) -> None:
         """
         Complex graph with multiple dependency paths.
 
@@ -198,28 +153,20 @@ class TestSort(TestDependencySorter):
 
         Valid orders include: A, B, C (or C, B), D, E
         """
-        id_a = RecordIdentifier(schema_name="public", table_name="a", pk_values=(1,))
-        id_b = RecordIdentifier(schema_name="public", table_name="b", pk_values=(2,))
-        id_c = RecordIdentifier(schema_name="public", table_name="c", pk_values=(3,))
-        id_d = RecordIdentifier(schema_name="public", table_name="d", pk_values=(4,))
-        id_e = RecordIdentifier(schema_name="public", table_name="e", pk_values=(5,))
-
-        record_a = RecordData(identifier=id_a, data={"id": 1}, dependencies=set())
-        record_b = RecordData(identifier=id_b, data={"id": 2}, dependencies={id_a})
-        record_c = RecordData(identifier=id_c, data={"id": 3}, dependencies={id_a})
-        record_d = RecordData(
-            identifier=id_d, data={"id": 4}, dependencies={id_b, id_c}
-        )
-        record_e = RecordData(identifier=id_e, data={"id": 5}, dependencies={id_d})
+        record_a = make_record("a", 1)
+        record_b = make_record("b", 2, record_a)
+        record_c = make_record("c", 3, record_a)
+        record_d = make_record("d", 4, record_b, record_c)
+        record_e = make_record("e", 5, record_d)
 
         result = sorter.sort({record_a, record_b, record_c, record_d, record_e})
 
         result_ids = [r.identifier for r in result]
-        a_idx = result_ids.index(id_a)
-        b_idx = result_ids.index(id_b)
-        c_idx = result_ids.index(id_c)
-        d_idx = result_ids.index(id_d)
-        e_idx = result_ids.index(id_e)
+        a_idx = result_ids.index(record_a.identifier)
+        b_idx = result_ids.index(record_b.identifier)
+        c_idx = result_ids.index(record_c.identifier)
+        d_idx = result_ids.index(record_d.identifier)
+        e_idx = result_ids.index(record_e.identifier)
 
         # Verify ordering constraints
         assert a_idx < b_idx  # A before B
@@ -240,70 +187,38 @@ class TestAnalyzeDependencies(TestDependencySorter):
         assert stats["max_dependencies"] == 0
         assert stats["avg_dependencies"] == 0.0
 
-    def test_single_record_no_deps(self, sorter: DependencySorter) -> None:
+    def test_single_record_no_deps(
+        self, sorter: DependencySorter, make_record: MakeRecord
+    ) -> None:
         """Single record with no dependencies."""
-        record = RecordData(
-            identifier=RecordIdentifier(
-                schema_name="public",
-                table_name="users",
-                pk_values=(1,),
-            ),
-            data={"id": 1},
-            dependencies=set(),
-        )
-        stats = sorter.analyze_dependencies({record})
+        stats = sorter.analyze_dependencies({make_record("users", 1)})
         assert stats["total_records"] == 1
         assert stats["records_with_deps"] == 0
         assert stats["max_dependencies"] == 0
         assert stats["avg_dependencies"] == 0.0
 
-    def test_single_record_with_deps(self, sorter: DependencySorter) -> None:
+    def test_single_record_with_deps(
+        self, sorter: DependencySorter, make_record: MakeRecord
+    ) -> None:
         """Single record with dependencies."""
-        dep_id = RecordIdentifier(
-            schema_name="public", table_name="other", pk_values=(99,)
-        )
-        record = RecordData(
-            identifier=RecordIdentifier(
-                schema_name="public",
-                table_name="users",
-                pk_values=(1,),
-            ),
-            data={"id": 1},
-            dependencies={dep_id},
-        )
-        stats = sorter.analyze_dependencies({record})
+        dep = make_record("other", 99)
+        stats = sorter.analyze_dependencies({make_record("users", 1, dep)})
         assert stats["total_records"] == 1
         assert stats["records_with_deps"] == 1
         assert stats["max_dependencies"] == 1
         assert stats["avg_dependencies"] == 1.0
 
-    def test_multiple_records_mixed_deps(self, sorter: DependencySorter) -> None:
+    def test_multiple_records_mixed_deps(
+        self, sorter: DependencySorter, make_record: MakeRecord
+    ) -> None:
         """Multiple records with varying dependencies."""
-        dep1 = RecordIdentifier(schema_name="public", table_name="dep", pk_values=(1,))
-        dep2 = RecordIdentifier(schema_name="public", table_name="dep", pk_values=(2,))
-        dep3 = RecordIdentifier(schema_name="public", table_name="dep", pk_values=(3,))
-
-        record_no_deps = RecordData(
-            identifier=RecordIdentifier(
-                schema_name="public", table_name="a", pk_values=(1,)
-            ),
-            data={"id": 1},
-            dependencies=set(),
-        )
-        record_one_dep = RecordData(
-            identifier=RecordIdentifier(
-                schema_name="public", table_name="b", pk_values=(2,)
-            ),
-            data={"id": 2},
-            dependencies={dep1},
-        )
-        record_three_deps = RecordData(
-            identifier=RecordIdentifier(
-                schema_name="public", table_name="c", pk_values=(3,)
-            ),
-            data={"id": 3},
-            dependencies={dep1, dep2, dep3},
-        )
+        dep1 = make_record("dep", 1)
+        dep2 = make_record("dep", 2)
+        dep3 = make_record("dep", 3)
+
+        record_no_deps = make_record("a", 1)
+        record_one_dep = make_record("b", 2, dep1)
+        record_three_deps = make_record("c", 3, dep1, dep2, dep3)
 
         stats = sorter.analyze_dependencies(
             {record_no_deps, record_one_dep, record_three_deps}
@@ -2,16 +2,38 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime, time
+import enum
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from uuid import UUID
 
 import pytest
 
+from pgslice.db.schema import SchemaIntrospector
+from pgslice.dumper import sql_generator
 from pgslice.dumper.sql_generator import SQLGenerator
 from pgslice.graph.models import Column, ForeignKey, RecordData, RecordIdentifier, Table
 
+# Frozen, so shared safely across tests instead of rebuilt in each Table
+AUTO_ID_COLUMN = Column(
+    name="id",
+    data_type="integer",
+    udt_name="int4",
+    nullable=False,
+    is_primary_key=True,
+    is_auto_generated=True,
+)
+ID_COLUMN = Column(
+    name="id",
+    data_type="integer",
+    udt_name="int4",
+    nullable=False,
+    is_primary_key=True,
+)
+NAME_COLUMN = Column(name="name", data_type="text", udt_name="text", nullable=False)
+
 
 class TestSQLGenerator:
     """Tests for SQLGenerator class."""
@@ -26,20 +48,8 @@ class TestSQLGenerator:
             schema_name="public",
             table_name="users",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                AUTO_ID_COLUMN,
+                NAME_COLUMN,
                 Column(
                     name="email",
                     data_type="text",
@@ -67,7 +77,20 @@ class TestSQLGenerator:
         return SQLGenerator(mock_introspector, batch_size=100)
 
 
-class TestFormatValue(TestSQLGenerator):
+class TestStatelessFormatting(TestSQLGenerator):
+    """Base for tests of formatting helpers that never read table metadata."""
+
+    @pytest.fixture
+    def mock_introspector(self) -> MagicMock:
+        """Create a SchemaIntrospector mock that fails any metadata lookup."""
+        introspector = MagicMock(spec=SchemaIntrospector)
+        introspector.get_table_metadata.side_effect = AssertionError(
+            "Unexpected metadata lookup"
+        )
+        return introspector
+
+
+class TestFormatValue(TestStatelessFormatting):
     """Tests for _format_value method."""
 
     def test_format_null(self, generator: SQLGenerator) -> None:
@@ -145,9 +168,7 @@ class TestFormatValue(TestSQLGenerator):
         """Dict should be formatted as JSON."""
         data = {"key": "value", "num": 42}
         result = generator._format_value(data)
-        # JSON output
-        assert "key" in result
-        assert "value" in result
+        assert result == """'{"key":"value","num":42}'"""
 
     def test_format_list_as_json_without_type_info(
         self, generator: SQLGenerator
@@ -155,7 +176,7 @@ class TestFormatValue(TestSQLGenerator):
         """List without type info should be formatted as JSON."""
         data = [1, 2, 3]
         result = generator._format_value(data)
-        assert result == "'[1, 2, 3]'"
+        assert result == "'[1,2,3]'"
 
     def test_format_list_as_array_with_type_info(self, generator: SQLGenerator) -> None:
         """List with ARRAY type info should be formatted as PostgreSQL array."""
@@ -188,6 +209,12 @@ class TestFormatValue(TestSQLGenerator):
         result = generator._format_value(data)
         assert result == "'\\x000102ff'"
 
+    def test_format_bytearray_as_bytea(self, generator: SQLGenerator) -> None:
+        """Bytearray should be formatted like bytes."""
+        data = bytearray(b"\x00\x01\x02\xff")
+        result = generator._format_value(data)
+        assert result == "'\\x000102ff'"
+
 
 class TestGenerateBulkInsert(TestSQLGenerator):
     """Tests for generate_bulk_insert method."""
@@ -300,6 +327,32 @@ class TestGenerateBatch(TestSQLGenerator):
         assert "BEGIN;" not in result
         assert "COMMIT;" not in result
 
+    @pytest.mark.parametrize("keep_pks", [True, False])
+    def test_generate_batch_iter_matches_generate_batch(
+        self, generator: SQLGenerator, keep_pks: bool
+    ) -> None:
+        """Streamed chunks should join into exactly the generate_batch output."""
+        records = [
+            RecordData(
+                identifier=RecordIdentifier(
+                    schema_name="public",
+                    table_name="users",
+                    pk_values=(i,),
+                ),
+                data={"id": i, "name": f"User {i}"},
+            )
+            for i in range(1, 4)
+        ]
+        generator.batch_size = 2
+
+        with patch.object(sql_generator, "datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 1)
+            chunks = list(generator.generate_batch_iter(records, keep_pks=keep_pks))
+            result = generator.generate_batch(records, keep_pks=keep_pks)
+
+        assert len(chunks) > 2
+        assert "".join(chunks) == result
+
     def test_includes_header(self, generator: SQLGenerator) -> None:
         """Should include header with metadata."""
         records = [
@@ -335,6 +388,7 @@ class TestGenerateBatch(TestSQLGenerator):
 
         # Should only have one insert for this record
         assert result.count("'Test") == 1
+        assert "-- Records: 1\n" in result
 
 
 class TestBatchSize(TestSQLGenerator):
@@ -360,6 +414,27 @@ class TestBatchSize(TestSQLGenerator):
         generator = SQLGenerator(mock_introspector, batch_size=50)
         assert generator.batch_size == 50
 
+    def test_unlimited_batch_capped_by_value_count(
+        self, mock_introspector: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Rows per INSERT should be capped by the per-statement value limit."""
+        monkeypatch.setattr(sql_generator, "_MAX_VALUES_PER_STATEMENT", 4)
+        generator = SQLGenerator(mock_introspector, batch_size=0)
+        records = [
+            RecordData(
+                identifier=RecordIdentifier(
+                    schema_name="public", table_name="users", pk_values=(i,)
+                ),
+                data={"id": i, "name": f"User {i}"},
+            )
+            for i in range(1, 4)
+        ]
+
+        result = generator.generate_batch(records, keep_pks=True)
+
+        # Two columns per row -> at most two rows per statement
+        assert result.count("INSERT INTO") == 2
+
 
 class TestColumnTypeCache(TestSQLGenerator):
     """Tests for column type caching."""
@@ -377,8 +452,124 @@ class TestColumnTypeCache(TestSQLGenerator):
         # Should only call introspector once due to caching
         assert mock_introspector.get_table_metadata.call_count == 1
 
+    def test_caches_table_metadata_across_helpers(
+        self, generator: SQLGenerator, mock_introspector: MagicMock
+    ) -> None:
+        """Helpers of the same table should share one metadata lookup."""
+        generator._get_column_types("public", "users")
+        generator._get_auto_generated_pk_columns("public", "users")
+        generator._get_pk_conflict_clause("public", "users")
+
+        assert mock_introspector.get_table_metadata.call_count == 1
+
+    def test_clear_metadata_cache(
+        self, generator: SQLGenerator, mock_introspector: MagicMock
+    ) -> None:
+        """clear_metadata_cache() should re-introspect and rebuild derived SQL."""
+        assert generator._get_pk_conflict_clause("public", "users") != ""
+
+        mock_introspector.get_table_metadata.return_value = Table(
+            schema_name="public",
+            table_name="users",
+            columns=[NAME_COLUMN],
+            primary_keys=[],
+            foreign_keys_outgoing=[],
+            foreign_keys_incoming=[],
+        )
+        generator.clear_metadata_cache()
+
+        assert generator._get_pk_conflict_clause("public", "users") == ""
+        assert mock_introspector.get_table_metadata.call_count == 2
+
+    def test_caches_auto_generated_pk_columns(
+        self, generator: SQLGenerator, mock_introspector: MagicMock
+    ) -> None:
+        """Should look up auto-generated PK columns once per table."""
+        first = generator._get_auto_generated_pk_columns("public", "users")
+        second = generator._get_auto_generated_pk_columns("public", "users")
+
+        assert first == second
+        assert mock_introspector.get_table_metadata.call_count == 1
+
+    def test_caches_column_list_sql(self, generator: SQLGenerator) -> None:
+        """Should quote a column list once and reuse it."""
+        columns_sql = generator._get_column_list_sql(["id", "name"])
+
+        assert columns_sql == '"id", "name"'
+        assert generator._get_column_list_sql(["id", "name"]) is columns_sql
 
-class TestArrayTypeHandling(TestSQLGenerator):
+    def test_caches_pk_conflict_clause(
+        self, generator: SQLGenerator, mock_introspector: MagicMock
+    ) -> None:
+        """Should build the bulk INSERT conflict clause once per table."""
+        clause = generator._get_pk_conflict_clause("public", "users")
+        generator._get_pk_conflict_clause("public", "users")
+
+        assert clause == '\nON CONFLICT ("id") DO NOTHING'
+        assert mock_introspector.get_table_metadata.call_count == 1
+
+    def test_format_rows_uses_array_column_type(
+        self, mock_introspector: MagicMock
+    ) -> None:
+        """Array columns should format lists as ARRAY literals."""
+        mock_introspector.get_table_metadata.return_value = Table(
+            schema_name="public",
+            table_name="posts",
+            columns=[
+                Column(name="tags", data_type="ARRAY", udt_name="_text", nullable=True),
+                Column(name="meta", data_type="jsonb", udt_name="jsonb", nullable=True),
+            ],
+            primary_keys=[],
+            foreign_keys_outgoing=[],
+            foreign_keys_incoming=[],
+        )
+        generator = SQLGenerator(mock_introspector)
+
+        records = [
+            RecordData(
+                identifier=RecordIdentifier(
+                    schema_name="public", table_name="posts", pk_values=(i,)
+                ),
+                data=data,
+            )
+            for i, data in enumerate(
+                [{"meta": [1], "tags": ["a"]}, {"meta": None, "tags": None}]
+            )
+        ]
+
+        assert generator._format_rows("public", "posts", ["meta", "tags"], records) == [
+            "'[1]', ARRAY['a']::text[]",
+            "NULL, NULL",
+        ]
+
+    def test_format_rows(self, generator: SQLGenerator) -> None:
+        """Should format each record's values in column order."""
+        records = [
+            RecordData(
+                identifier=RecordIdentifier(
+                    schema_name="public", table_name="users", pk_values=(i,)
+                ),
+                data={"age": age, "id": i, "name": name},
+            )
+            for i, age, name in [(1, 30, "a"), (2, None, "it's"), (3, 41, "c")]
+        ]
+        columns = ["age", "id", "name"]
+
+        assert generator._format_rows("public", "users", columns, records) == [
+            "30, 1, 'a'",
+            "NULL, 2, 'it''s'",
+            "41, 3, 'c'",
+        ]
+        assert generator._format_rows("public", "users", columns, records[:1]) == [
+            "30, 1, 'a'"
+        ]
+        assert generator._format_rows(
+            "public", "users", ["id"], records, frozenset({"id"})
+        ) == ["'1'", "'2'", "'3'"]
+        assert generator._format_rows("public", "users", [], records) == ["", "", ""]
+
+
+class TestArrayTypeHandling(TestStatelessFormatting):
     """Tests for array type handling."""
 
     def test_is_array_type(self, generator: SQLGenerator) -> None:
@@ -405,6 +596,21 @@ class TestArrayTypeHandling(TestSQLGenerator):
         assert "NULL" in result
         assert "3" in result
 
+    def test_format_array_element_literals(self, generator: SQLGenerator) -> None:
+        """Elements should be written according to the element type."""
+        assert (
+            generator._format_array_value([True, None, False], "boolean")
+            == "ARRAY[TRUE, NULL, FALSE]::boolean[]"
+        )
+        assert (
+            generator._format_array_value(["it's", "a\\b"], "text")
+            == "ARRAY['it''s', 'a\\\\b']::text[]"
+        )
+        assert (
+            generator._format_array_value([1.5, 2], "NUMERIC")
+            == "ARRAY[1.5, 2]::NUMERIC[]"
+        )
+
 
 class TestPlpgsqlMode(TestSQLGenerator):
     """Tests for PL/pgSQL mode with ID remapping."""
@@ -416,20 +622,8 @@ class TestPlpgsqlMode(TestSQLGenerator):
             schema_name="public",
             table_name="products",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                AUTO_ID_COLUMN,
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -502,14 +696,7 @@ class TestPlpgsqlMode(TestSQLGenerator):
             schema_name="public",
             table_name="test_table",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -580,19 +767,11 @@ class TestFkRemapping(TestSQLGenerator):
     @pytest.fixture
     def orders_table_with_fk(self) -> Table:
         """Create orders table with FK to users."""
-        from pgslice.graph.models import ForeignKey
-
         return Table(
             schema_name="public",
             table_name="orders",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
+                ID_COLUMN,
                 Column(
                     name="user_id",
                     data_type="integer",
@@ -676,20 +855,8 @@ class TestFkRemapping(TestSQLGenerator):
             schema_name="public",
             table_name="products",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                AUTO_ID_COLUMN,
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -722,20 +889,8 @@ class TestFkRemapping(TestSQLGenerator):
             schema_name="public",
             table_name="products",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                AUTO_ID_COLUMN,
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -771,8 +926,8 @@ class TestFkRemapping(TestSQLGenerator):
         assert "IS NOT DISTINCT FROM" in sql  # NULL-safe natural key comparison
         assert "array_agg" in sql
         assert "v_new_ids" in sql
-        assert "FOR i IN 1..array_length" in sql
-        assert "END LOOP" in sql
+        assert "FROM unnest(v_old_ids_products, v_new_ids_products)" in sql
+        assert "LOOP" not in sql
 
     def test_get_fk_columns_to_remap(
         self, mock_introspector: MagicMock, orders_table_with_fk: Table
@@ -798,15 +953,59 @@ class TestFkRemapping(TestSQLGenerator):
 
     def test_serialize_pk_value_composite(self, mock_introspector: MagicMock) -> None:
         """Should serialize composite PK value."""
-        import json
-
         generator = SQLGenerator(mock_introspector)
 
         result = generator._serialize_pk_value(("123", "456"))
-        assert result == json.dumps(["123", "456"])
+        assert result == "123|456"
+
+    @pytest.mark.parametrize(
+        "pk_values",
+        [
+            ("a|b", "c"),
+            ("a", "b|c"),
+            ("a\\", "|b"),
+            ("\\|", ""),
+            ("|", "|", "|"),
+        ],
+    )
+    def test_serialize_pk_value_composite_round_trip(
+        self, mock_introspector: MagicMock, pk_values: tuple[str, ...]
+    ) -> None:
+        """Composite values containing the separator should split back apart."""
+        generator = SQLGenerator(mock_introspector)
+        separator = SQLGenerator.COMPOSITE_PK_SEPARATOR
+
+        serialized = generator._serialize_pk_value(pk_values)
+
+        parts = [""]
+        chars = iter(serialized)
+        for char in chars:
+            if char == "\\":
+                parts[-1] += next(chars)
+            elif char == separator:
+                parts.append("")
+            else:
+                parts[-1] += char
+        assert tuple(parts) == pk_values
+
+    def test_serialize_old_pk_values(self, mock_introspector: MagicMock) -> None:
+        """Should serialize record PKs in order, single and composite."""
+        generator = SQLGenerator(mock_introspector)
 
+        def make(*pk_values: Any) -> RecordData:
+            return RecordData(
+                identifier=RecordIdentifier(
+                    schema_name="public", table_name="t", pk_values=pk_values
+                ),
+                data={},
+            )
 
-class TestDataTypeEdgeCases(TestSQLGenerator):
+        assert generator._serialize_old_pk_values([make(1), make(2)]) == ["1", "2"]
+        assert generator._serialize_old_pk_values([make(1, 2)]) == ["1|2"]
+        assert generator._format_old_ids_array(["1", "2"]) == "'1', '2'"
+
+
+class TestDataTypeEdgeCases(TestStatelessFormatting):
     """Tests for edge cases in data type handling."""
 
     def test_format_value_memoryview(self, generator: SQLGenerator) -> None:
@@ -826,17 +1025,47 @@ class TestDataTypeEdgeCases(TestSQLGenerator):
         result = generator._format_value(CustomObject())
         assert "custom_value" in result
 
+    def test_format_value_subclasses_of_known_types(
+        self, generator: SQLGenerator
+    ) -> None:
+        """Subclasses should be formatted like their base type."""
+
+        class Score(int):
+            pass
+
+        class Label(str):
+            pass
+
+        assert generator._format_value(Score(1)) == "1"
+        assert generator._format_value(Label("it's")) == "'it''s'"
+        # Resolved subclasses are memoized apart from the exact-type table
+        assert Score not in sql_generator._VALUE_FORMATTERS
+        assert Label not in sql_generator._VALUE_FORMATTERS
+
+    def test_format_value_str_enum_uses_value(self, generator: SQLGenerator) -> None:
+        """str-mixin enums should be formatted by value, not by member name."""
+
+        class Status(str, enum.Enum):
+            ACTIVE = "active"
+            QUOTED = "it's"
+
+        assert generator._format_value(Status.ACTIVE) == "'active'"
+        assert generator._format_value(Status.QUOTED) == "'it''s'"
+
     def test_format_multidimensional_array(self, generator: SQLGenerator) -> None:
         """Should handle 2D and 3D arrays."""
         # 2D array
         data_2d = [[1, 2], [3, 4]]
         result = generator._format_array_value(data_2d, "integer")
-        assert "ARRAY" in result or "[[" in result
+        assert result == "ARRAY[[1, 2], [3, 4]]::integer[]"
+
+        # 3D array with NULLs and text escaping
+        data_3d = [[["a'b", None]], [["c", "d"]]]
+        result = generator._format_array_value(data_3d, "text")
+        assert result == "ARRAY[[['a''b', NULL]], [['c', 'd']]]::text[]"
 
     def test_format_array_of_uuids(self, generator: SQLGenerator) -> None:
         """Should handle UUID arrays."""
-        from uuid import UUID
-
         uuids = [UUID("12345678-1234-5678-1234-567812345678")]
         result = generator._format_array_value(uuids, "uuid")
         assert "12345678-1234-5678-1234-567812345678" in result
@@ -848,42 +1077,29 @@ class TestDataTypeEdgeCases(TestSQLGenerator):
         assert "level1" in result
         assert "level3" in result
 
-    def test_format_string_with_unicode(self, generator: SQLGenerator) -> None:
-        """Should handle Unicode characters."""
-        text = "Hello 世界 🌍"
-        result = generator._format_value(text)
-        assert "世界" in result
-        assert "🌍" in result
-
-    def test_format_string_with_control_chars(self, generator: SQLGenerator) -> None:
-        """Should handle control characters like \\n, \\t, \\r."""
-        text = "Line1\nLine2\tTab\rReturn"
-        result = generator._format_value(text)
-        assert isinstance(result, str)
-        # Should escape or preserve control characters
-
-    def test_format_timezone_aware_datetime(self, generator: SQLGenerator) -> None:
-        """Should handle timezone-aware datetime."""
-        from datetime import datetime, timezone
-
-        dt = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
-        result = generator._format_value(dt)
-        assert "2024-01-01" in result
-        assert "12:00:00" in result
-
-    def test_format_decimal_with_precision(self, generator: SQLGenerator) -> None:
-        """Should handle Decimal with precision."""
-        from decimal import Decimal
-
-        value = Decimal("123.456789")
-        result = generator._format_value(value)
-        assert "123.456789" in result
-
-    def test_format_scientific_notation_float(self, generator: SQLGenerator) -> None:
-        """Should handle scientific notation floats."""
-        value = 1.5e10
-        result = generator._format_value(value)
-        assert isinstance(result, str)
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            pytest.param("Hello 世界 🌍", "'Hello 世界 🌍'", id="unicode"),
+            pytest.param(
+                "Line1\nLine2\tTab\rReturn",
+                "'Line1\nLine2\tTab\rReturn'",
+                id="control_chars",
+            ),
+            pytest.param(
+                datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+                "'2024-01-01T12:00:00+00:00'",
+                id="timezone_aware_datetime",
+            ),
+            pytest.param(Decimal("123.456789"), "123.456789", id="decimal_precision"),
+            pytest.param(1.5e10, "15000000000.0", id="scientific_notation_float"),
+        ],
+    )
+    def test_format_value_edge_cases(
+        self, generator: SQLGenerator, value: Any, expected: str
+    ) -> None:
+        """Unicode, control chars, tz-aware datetimes, precise decimals, big floats."""
+        assert generator._format_value(value) == expected
 
     def test_format_empty_array(self, generator: SQLGenerator) -> None:
         """Should handle empty arrays."""
@@ -955,13 +1171,7 @@ class TestOnConflictHandling(TestSQLGenerator):
             schema_name="public",
             table_name="users",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
+                ID_COLUMN,
                 Column(
                     name="email",
                     data_type="text",
@@ -988,6 +1198,49 @@ class TestOnConflictHandling(TestSQLGenerator):
         assert natural_keys is None
         assert "ON CONFLICT" in on_conflict
 
+    def test_build_on_conflict_skips_auto_gen_pk_unique_constraint(
+        self, mock_introspector: MagicMock
+    ) -> None:
+        """Unique constraints on auto-generated PKs alone should be skipped."""
+        table = Table(
+            schema_name="public",
+            table_name="users",
+            columns=[
+                AUTO_ID_COLUMN,
+                Column(name="email", data_type="text", udt_name="text", nullable=False),
+            ],
+            primary_keys=["id"],
+            foreign_keys_outgoing=[],
+            foreign_keys_incoming=[],
+            unique_constraints={"users_id_key": ["id"], "uq_email": ["email"]},
+        )
+        generator = SQLGenerator(mock_introspector)
+
+        on_conflict, natural_keys = generator._build_on_conflict_clause(
+            table, ["email"], ["id"], "public", "users"
+        )
+
+        assert on_conflict == (
+            'ON CONFLICT ("email") DO UPDATE SET "email" = EXCLUDED."email"'
+        )
+        assert natural_keys is None
+
+    def test_build_on_conflict_is_cached(self, mock_introspector: MagicMock) -> None:
+        """Repeated calls with the same inputs should reuse the first result."""
+        generator = SQLGenerator(mock_introspector)
+        table = mock_introspector.get_table_metadata.return_value
+
+        first = generator._build_on_conflict_clause(
+            table, ["id", "name"], [], "public", "users"
+        )
+        with patch.object(generator, "_compute_on_conflict_clause") as compute:
+            second = generator._build_on_conflict_clause(
+                table, ["id", "name"], [], "public", "users"
+            )
+
+        assert second is first
+        compute.assert_not_called()
+
     def test_build_on_conflict_without_constraints(
         self, mock_introspector: MagicMock
     ) -> None:
@@ -1041,12 +1294,7 @@ class TestOnConflictHandling(TestSQLGenerator):
                     is_primary_key=True,
                     is_auto_generated=False,  # NOT auto-generated
                 ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -1193,20 +1441,8 @@ class TestOnConflictHandling(TestSQLGenerator):
             schema_name="public",
             table_name="products",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                AUTO_ID_COLUMN,
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -1288,12 +1524,7 @@ class TestOnConflictHandling(TestSQLGenerator):
                     is_primary_key=True,
                     is_auto_generated=False,
                 ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -1354,14 +1585,7 @@ class TestHelperMethods(TestSQLGenerator):
             schema_name="public",
             table_name="products",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -1400,6 +1624,17 @@ class TestHelperMethods(TestSQLGenerator):
         result = generator._has_auto_generated_pks("public", "manual_ids")
         assert result is False
 
+    def test_has_auto_generated_pks_is_cached(
+        self, mock_introspector: MagicMock
+    ) -> None:
+        """Repeated checks for a table should fetch its metadata once."""
+        generator = SQLGenerator(mock_introspector)
+
+        generator._has_auto_generated_pks("public", "users")
+        generator._has_auto_generated_pks("public", "users")
+
+        assert mock_introspector.get_table_metadata.call_count == 1
+
 
 class TestInsertWithFkRemappingAdvanced:
     """Tests for _generate_insert_with_fk_remapping method - complex scenarios."""
@@ -1425,19 +1660,8 @@ class TestInsertWithFkRemappingAdvanced:
             schema_name="public",
             table_name="tags",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                ID_COLUMN,
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -1486,13 +1710,7 @@ class TestInsertWithFkRemappingAdvanced:
             schema_name="public",
             table_name="orders",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
+                ID_COLUMN,
                 Column(
                     name="user_id",
                     data_type="integer",
@@ -1557,6 +1775,47 @@ class TestInsertWithFkRemappingAdvanced:
         # Should have old_user_id column alias
         assert "old_user_id" in sql
 
+    def test_caches_fk_remap_select_sql(self, mock_introspector: MagicMock) -> None:
+        """Should build the SELECT/JOIN skeleton once per table and columns."""
+        mock_introspector.get_table_metadata.return_value = Table(
+            schema_name="public",
+            table_name="orders",
+            columns=[
+                ID_COLUMN,
+                Column(
+                    name="user_id", data_type="integer", udt_name="int4", nullable=True
+                ),
+            ],
+            primary_keys=["id"],
+            foreign_keys_outgoing=[
+                ForeignKey(
+                    constraint_name="fk_orders_user_id",
+                    source_table="public.orders",
+                    source_column="user_id",
+                    target_table="public.users",
+                    target_column="id",
+                )
+            ],
+            foreign_keys_incoming=[],
+        )
+        generator = SQLGenerator(mock_introspector)
+        remapped = {("public", "users")}
+
+        select_sql = generator._get_fk_remap_select_sql(
+            "public", "orders", ["id", "user_id"], remapped
+        )
+
+        assert (
+            generator._get_fk_remap_select_sql(
+                "public", "orders", ["id", "user_id"], set(remapped)
+            )
+            is select_sql
+        )
+        select_clause, data_aliases_sql, join_clause = select_sql
+        assert select_clause == 'data."id"::integer,\n        map0.new_id::integer'
+        assert data_aliases_sql == '"id", "old_user_id"'
+        assert join_clause.startswith("    JOIN _pgslice_id_map map0\n")
+
     def test_array_type_in_select_clause(self, mock_introspector: MagicMock) -> None:
         """Should handle ARRAY types correctly in INSERT-SELECT."""
         # Setup table with array column and FK to remap
@@ -1564,13 +1823,7 @@ class TestInsertWithFkRemappingAdvanced:
             schema_name="public",
             table_name="posts",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
+                ID_COLUMN,
                 Column(
                     name="author_id",
                     data_type="integer",
@@ -1634,13 +1887,7 @@ class TestInsertWithFkRemappingAdvanced:
             schema_name="public",
             table_name="tickets",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
+                ID_COLUMN,
                 Column(
                     name="user_id",
                     data_type="integer",
@@ -1778,14 +2025,7 @@ class TestInsertWithFkRemappingAdvanced:
             schema_name="public",
             table_name="comments",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="post_id",
                     data_type="integer",
@@ -1854,9 +2094,15 @@ class TestInsertWithFkRemappingAdvanced:
         assert "array_agg(id) INTO v_new_ids_comments" in sql
         # Should have array of old IDs
         assert "v_old_ids_comments := ARRAY['100', '101', '102']" in sql
-        # Should have FOR LOOP to insert mappings
-        assert "FOR i IN 1..array_length(v_new_ids_comments, 1) LOOP" in sql
-        assert "INSERT INTO _pgslice_id_map VALUES" in sql
+        # Should store all mappings in one set-based INSERT
+        assert (
+            "    INSERT INTO _pgslice_id_map\n"
+            """    SELECT '"public"."comments"', ids.old_id, ids.new_id::TEXT\n"""
+            "    FROM unnest(v_old_ids_comments, v_new_ids_comments)"
+            " AS ids(old_id, new_id)\n"
+            "    WHERE ids.new_id IS NOT NULL;"
+        ) in sql
+        assert "LOOP" not in sql
         # Should have FK remapping JOIN
         assert "JOIN _pgslice_id_map" in sql
 
@@ -1945,13 +2191,7 @@ class TestInsertWithFkRemappingAdvanced:
             schema_name="public",
             table_name="order_items",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
+                ID_COLUMN,
                 Column(
                     name="order_id",
                     data_type="integer",
@@ -2033,14 +2273,7 @@ class TestInsertWithFkRemappingAdvanced:
             schema_name="public",
             table_name="comments",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="post_id",
                     data_type="integer",
@@ -2251,13 +2484,7 @@ class TestReservedKeywordColumns(TestSQLGenerator):
             schema_name="public",
             table_name="shipments_shipment",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
+                ID_COLUMN,
                 Column(
                     name="reference_id",
                     data_type="character varying",
@@ -2296,6 +2523,13 @@ class TestReservedKeywordColumns(TestSQLGenerator):
         assert generator._quote_identifier('col"name') == '"col""name"'
         assert generator._quote_identifier('my"table"name') == '"my""table""name"'
 
+    def test_column_list_escapes_embedded_quotes(self, generator: SQLGenerator) -> None:
+        """INSERT column lists should quote names like _quote_identifier."""
+        assert (
+            generator._get_column_list_sql(["user", 'col"name'])
+            == '"user", "col""name"'
+        )
+
     def test_insert_with_references_column(
         self, mock_introspector: MagicMock, table_with_references_column: Table
     ) -> None:
@@ -2332,14 +2566,7 @@ class TestReservedKeywordColumns(TestSQLGenerator):
             schema_name="public",
             table_name="posts",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="user",  # Reserved keyword as FK!
                     data_type="integer",
@@ -2399,13 +2626,7 @@ class TestReservedKeywordColumns(TestSQLGenerator):
             schema_name="public",
             table_name="test_reserved",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
+                ID_COLUMN,
                 Column(
                     name="user",  # Reserved
                     data_type="character varying",
@@ -2476,20 +2697,8 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="public",
             table_name="roles",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                AUTO_ID_COLUMN,
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -2508,14 +2717,7 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="public",
             table_name="statuses",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="code",
                     data_type="varchar",
@@ -2540,14 +2742,7 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="public",
             table_name="countries",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="country_code",
                     data_type="varchar",
@@ -2575,14 +2770,7 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="shipments",
             table_name="shipmentreprole",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="name",
                     data_type="varchar",
@@ -2611,26 +2799,14 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="public",
             table_name="products",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="sku",
                     data_type="varchar",
                     udt_name="varchar",
                     nullable=False,
                 ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -2665,20 +2841,8 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="public",
             table_name="roles",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                AUTO_ID_COLUMN,
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -2705,20 +2869,8 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="public",
             table_name="roles",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
+                AUTO_ID_COLUMN,
+                NAME_COLUMN,
             ],
             primary_keys=["id"],
             foreign_keys_outgoing=[],
@@ -2762,14 +2914,7 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="public",
             table_name="statuses",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="code",
                     data_type="varchar",
@@ -2840,14 +2985,7 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="public",
             table_name="tenant_settings",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="tenant_id",
                     data_type="integer",
@@ -2916,14 +3054,7 @@ class TestNaturalKeyDetection(TestSQLGenerator):
             schema_name="public",
             table_name="logs",
             columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                    is_auto_generated=True,
-                ),
+                AUTO_ID_COLUMN,
                 Column(
                     name="message",
                     data_type="text",
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import dataclasses
+import os
+import subprocess
+import sys
 from datetime import datetime
 
 import pytest
-from faker import Faker
 
 from pgslice.graph.models import (
     Column,
@@ -16,8 +19,34 @@ from pgslice.graph.models import (
     Table,
     TimeframeFilter,
 )
+from tests.factories import ColumnFactory
+
+_EXPECTED_COLUMN_TYPES = (
+    "INTEGER",
+    "BIGINT",
+    "SMALLINT",
+    "TEXT",
+    "VARCHAR",
+    "CHAR",
+    "BOOLEAN",
+    "TIMESTAMP",
+    "TIMESTAMPTZ",
+    "DATE",
+    "TIME",
+    "UUID",
+    "JSON",
+    "JSONB",
+    "NUMERIC",
+    "REAL",
+    "DOUBLE",
+    "BYTEA",
+    "ARRAY",
+    "OTHER",
+)
 
-fake = Faker()
+# datetimes are immutable, so timeframe tests share these instances
+_START_2024 = datetime(2024, 1, 1)
+_END_2024 = datetime(2024, 12, 31)
 
 
 class TestColumnType:
@@ -45,32 +74,10 @@ class TestColumnType:
         """Should have OTHER type for unknown types."""
         assert ColumnType.OTHER.value == "other"
 
-    def test_all_expected_types_exist(self) -> None:
-        """All expected PostgreSQL types should exist."""
-        expected_types = [
-            "INTEGER",
-            "BIGINT",
-            "SMALLINT",
-            "TEXT",
-            "VARCHAR",
-            "CHAR",
-            "BOOLEAN",
-            "TIMESTAMP",
-            "TIMESTAMPTZ",
-            "DATE",
-            "TIME",
-            "UUID",
-            "JSON",
-            "JSONB",
-            "NUMERIC",
-            "REAL",
-            "DOUBLE",
-            "BYTEA",
-            "ARRAY",
-            "OTHER",
-        ]
-        for type_name in expected_types:
-            assert hasattr(ColumnType, type_name), f"Missing type: {type_name}"
+    @pytest.mark.parametrize("type_name", _EXPECTED_COLUMN_TYPES)
+    def test_expected_type_exists(self, type_name: str) -> None:
+        """Each expected PostgreSQL type should exist."""
+        assert hasattr(ColumnType, type_name), f"Missing type: {type_name}"
 
 
 class TestColumn:
@@ -125,16 +132,10 @@ class TestColumn:
         )
         assert col.default == "now()"
 
-    def test_column_is_frozen(self) -> None:
+    def test_column_is_frozen(self, sample_column: Column) -> None:
         """Column dataclass should be frozen (immutable)."""
-        col = Column(
-            name="test",
-            data_type="text",
-            udt_name="text",
-            nullable=True,
-        )
         with pytest.raises(AttributeError):
-            col.name = "new_name"  # type: ignore
+            sample_column.name = "new_name"  # type: ignore
 
 
 class TestForeignKey:
@@ -178,72 +179,37 @@ class TestForeignKey:
         )
         assert fk.on_delete == "CASCADE"
 
-    def test_foreign_key_is_hashable(self) -> None:
+    def test_foreign_key_is_hashable(self, sample_foreign_key: ForeignKey) -> None:
         """ForeignKey should be hashable for use in sets."""
-        fk = ForeignKey(
-            constraint_name="fk_test",
-            source_table="orders",
-            source_column="user_id",
-            target_table="users",
-            target_column="id",
-        )
         # Should not raise
-        hash_val = hash(fk)
+        hash_val = hash(sample_foreign_key)
         assert isinstance(hash_val, int)
 
-    def test_foreign_key_in_set(self) -> None:
-        """ForeignKey should work in sets."""
-        fk1 = ForeignKey(
-            constraint_name="fk_1",
-            source_table="orders",
-            source_column="user_id",
-            target_table="users",
-            target_column="id",
-        )
-        fk2 = ForeignKey(
-            constraint_name="fk_1",
-            source_table="orders",
-            source_column="user_id",
-            target_table="users",
-            target_column="id",
-        )
-        # Identical ForeignKeys - should have same hash
-        fk_set = {fk1, fk2}
-        # Same FK, so set should have 1 element
-        assert len(fk_set) == 1
-
-    def test_foreign_key_different_constraints_in_set(self) -> None:
-        """ForeignKeys with different constraint names are different."""
-        fk1 = ForeignKey(
-            constraint_name="fk_1",
-            source_table="orders",
-            source_column="user_id",
-            target_table="users",
-            target_column="id",
-        )
-        fk2 = ForeignKey(
-            constraint_name="fk_2",
-            source_table="orders",
-            source_column="user_id",
-            target_table="users",
-            target_column="id",
-        )
-        # Different constraint names - different FKs
-        fk_set = {fk1, fk2}
-        # Different FKs, so set should have 2 elements
-        assert len(fk_set) == 2
-
-    def test_foreign_key_is_frozen(self) -> None:
+    @pytest.mark.parametrize(
+        ("second_constraint_name", "expected_size"),
+        [("fk_1", 1), ("fk_2", 2)],
+        ids=["same_constraint", "different_constraint"],
+    )
+    def test_foreign_key_in_set(
+        self, second_constraint_name: str, expected_size: int
+    ) -> None:
+        """ForeignKeys dedupe in sets only when the constraint names match too."""
+        fk1, fk2 = (
+            ForeignKey(
+                constraint_name=constraint_name,
+                source_table="orders",
+                source_column="user_id",
+                target_table="users",
+                target_column="id",
+            )
+            for constraint_name in ("fk_1", second_constraint_name)
+        )
+        assert len({fk1, fk2}) == expected_size
+
+    def test_foreign_key_is_frozen(self, sample_foreign_key: ForeignKey) -> None:
         """ForeignKey dataclass should be frozen."""
-        fk = ForeignKey(
-            constraint_name="fk_test",
-            source_table="a",
-            source_column="b_id",
-            target_table="b",
-            target_column="id",
-        )
         with pytest.raises(AttributeError):
-            fk.source_table = "new_table"  # type: ignore
+            sample_foreign_key.source_table = "new_table"  # type: ignore
 
 
 class TestTable:
@@ -251,13 +217,7 @@ class TestTable:
 
     def test_create_basic_table(self) -> None:
         """Can create a basic table."""
-        col = Column(
-            name="id",
-            data_type="integer",
-            udt_name="int4",
-            nullable=False,
-            is_primary_key=True,
-        )
+        col = ColumnFactory.create_primary_key(auto_generated=False)
         table = Table(
             schema_name="public",
             table_name="users",
@@ -282,6 +242,63 @@ class TestTable:
         )
         assert table.full_name == "custom.orders"
 
+    def test_columns_by_name_indexes_columns(self) -> None:
+        """columns_by_name should map each column name to its Column."""
+        id_col = ColumnFactory.create_primary_key()
+        email_col = ColumnFactory.create_text("email")
+        table = Table(
+            schema_name="public",
+            table_name="users",
+            columns=[id_col, email_col],
+            primary_keys=["id"],
+            foreign_keys_outgoing=[],
+            foreign_keys_incoming=[],
+        )
+        assert table.columns_by_name == {"id": id_col, "email": email_col}
+        assert table.columns_by_name.get("missing") is None
+
+    def test_columns_by_name_follows_column_changes(self) -> None:
+        """columns_by_name should follow appended, reassigned and replaced columns."""
+        id_col = ColumnFactory.create_primary_key()
+        email_col = ColumnFactory.create_text("email")
+        table = Table(
+            schema_name="public",
+            table_name="users",
+            columns=[id_col],
+            primary_keys=["id"],
+            foreign_keys_outgoing=[],
+            foreign_keys_incoming=[],
+        )
+        assert table.columns_by_name == {"id": id_col}
+
+        table.columns.append(email_col)
+        assert table.columns_by_name == {"id": id_col, "email": email_col}
+
+        table.columns = [email_col]
+        assert table.columns_by_name == {"email": email_col}
+
+        uuid_col = ColumnFactory.create_text("uuid")
+        table.columns[0] = uuid_col
+        assert table.columns_by_name == {"uuid": uuid_col}
+
+    def test_columns_index_is_not_a_field(self) -> None:
+        """The column index cache should stay out of the dataclass fields."""
+        table = Table(
+            schema_name="public",
+            table_name="users",
+            columns=[ColumnFactory.create_primary_key()],
+            primary_keys=["id"],
+            foreign_keys_outgoing=[],
+            foreign_keys_incoming=[],
+        )
+        assert table.columns_by_name  # builds the index
+
+        assert "_columns_index" not in {f.name for f in dataclasses.fields(Table)}
+        assert "_columns_index" not in dataclasses.asdict(table)
+        assert dataclasses.replace(table, table_name="people").columns_by_name == (
+            table.columns_by_name
+        )
+
     def test_table_with_foreign_keys(self) -> None:
         """Can create table with foreign keys."""
         fk = ForeignKey(
@@ -362,16 +379,24 @@ class TestRecordIdentifier:
         )
         assert rid.pk_values == ("1", "2")
 
-    def test_identifier_is_hashable(self) -> None:
+    def test_identifier_is_hashable(
+        self, sample_record_identifier: RecordIdentifier
+    ) -> None:
         """RecordIdentifier should be hashable."""
-        rid = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        hash_val = hash(rid)
+        hash_val = hash(sample_record_identifier)
         assert isinstance(hash_val, int)
 
+    def test_identifier_hash_uses_normalized_pk_values(self) -> None:
+        """Hash is precomputed from the string-normalized PK values."""
+        rid_int = RecordIdentifier(
+            table_name="users", schema_name="public", pk_values=(1,)
+        )
+        rid_str = RecordIdentifier(
+            table_name="users", schema_name="public", pk_values=("1",)
+        )
+        assert hash(rid_int) == hash(rid_str) == hash(("public", "users", ("1",)))
+        assert "_hash" not in repr(rid_int)
+
     def test_identifier_in_set(self) -> None:
         """RecordIdentifier should work in sets."""
         rid1 = RecordIdentifier(
@@ -392,48 +417,6 @@ class TestRecordIdentifier:
         rid_set = {rid1, rid2, rid3}
         assert len(rid_set) == 2  # rid1 and rid2 are equal
 
-    def test_identifier_equality(self) -> None:
-        """Equal identifiers should be equal."""
-        rid1 = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        rid2 = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        assert rid1 == rid2
-
-    def test_identifier_inequality_different_table(self) -> None:
-        """Different tables should not be equal."""
-        rid1 = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        rid2 = RecordIdentifier(
-            table_name="orders",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        assert rid1 != rid2
-
-    def test_identifier_inequality_different_pk(self) -> None:
-        """Different PKs should not be equal."""
-        rid1 = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        rid2 = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(2,),
-        )
-        assert rid1 != rid2
-
     def test_identifier_repr(self) -> None:
         """repr should show schema.table(pk)."""
         rid = RecordIdentifier(
@@ -452,16 +435,105 @@ class TestRecordIdentifier:
         )
         assert repr(rid) == "public.order_items(1, 2)"
 
-    def test_identifier_not_equal_to_other_types(self) -> None:
-        """RecordIdentifier should not equal other types."""
+    def test_identifier_repr_is_cached(self) -> None:
+        """repr should be built once and not affect equality."""
         rid = RecordIdentifier(
             table_name="users",
             schema_name="public",
-            pk_values=(1,),
-        )
-        assert rid != "public.users(1)"
-        assert rid != 1
-        assert rid != None  # noqa: E711
+            pk_values=(7,),
+        )
+        first = repr(rid)
+        assert repr(rid) is first
+        assert rid == RecordIdentifier(
+            table_name="users", schema_name="public", pk_values=(7,)
+        )
+
+    def test_identifier_pickle_across_hash_seeds(self) -> None:
+        """An identifier pickled under one hash seed should hash right under another."""
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        dump = (
+            "import pickle, sys\n"
+            "from pgslice.graph.models import RecordIdentifier\n"
+            "rid = RecordIdentifier('users', 'public', (1, 'a'))\n"
+            "hash(rid)\n"
+            "sys.stdout.buffer.write(pickle.dumps(rid))\n"
+        )
+        load = (
+            "import pickle, sys\n"
+            "from pgslice.graph.models import RecordIdentifier\n"
+            "rid = pickle.loads(sys.stdin.buffer.read())\n"
+            "fresh = RecordIdentifier('users', 'public', (1, 'a'))\n"
+            "assert rid == fresh and hash(rid) == hash(fresh) and rid in {fresh}\n"
+        )
+        pickled = subprocess.run(
+            [sys.executable, "-c", dump],
+            env={**env, "PYTHONHASHSEED": "1"},
+            capture_output=True,
+            check=True,
+        ).stdout
+        subprocess.run(
+            [sys.executable, "-c", load],
+            env={**env, "PYTHONHASHSEED": "2"},
+            input=pickled,
+            capture_output=True,
+            check=True,
+        )
+
+    @pytest.mark.parametrize(
+        ("other", "expected"),
+        [
+            (
+                RecordIdentifier(
+                    table_name="users", schema_name="public", pk_values=(1,)
+                ),
+                True,
+            ),
+            (
+                RecordIdentifier(
+                    table_name="orders", schema_name="public", pk_values=(1,)
+                ),
+                False,
+            ),
+            (
+                RecordIdentifier(
+                    table_name="users", schema_name="public", pk_values=(2,)
+                ),
+                False,
+            ),
+            ("public.users(1)", False),
+            (1, False),
+            (None, False),
+        ],
+        ids=["equal", "different_table", "different_pk", "str", "int", "none"],
+    )
+    def test_identifier_equality(
+        self,
+        sample_record_identifier: RecordIdentifier,
+        other: object,
+        expected: bool,
+    ) -> None:
+        """Identifiers are equal only to identifiers with the same table and PK."""
+        assert (sample_record_identifier == other) is expected
+        assert (sample_record_identifier != other) is not expected
+
+
+@pytest.fixture(scope="module")
+def record_data_trio(
+    sample_record_identifier: RecordIdentifier,
+) -> tuple[RecordData, RecordData, RecordData]:
+    """Two records sharing an identifier and one with a different PK."""
+    other_rid = RecordIdentifier(
+        table_name="users",
+        schema_name="public",
+        pk_values=(2,),
+    )
+    return (
+        RecordData(identifier=sample_record_identifier, data={"id": 1}),
+        RecordData(
+            identifier=sample_record_identifier, data={"id": 1, "extra": "field"}
+        ),
+        RecordData(identifier=other_rid, data={"id": 2}),
+    )
 
 
 class TestRecordData:
@@ -482,23 +554,27 @@ class TestRecordData:
         assert data.data["id"] == 1
         assert data.data["name"] == "Test User"
 
-    def test_dependencies_default_empty(self) -> None:
+    def test_dependencies_default_empty(
+        self, sample_record_identifier: RecordIdentifier
+    ) -> None:
         """Dependencies should default to empty set."""
-        rid = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        data = RecordData(identifier=rid, data={})
+        data = RecordData(identifier=sample_record_identifier, data={})
         assert data.dependencies == set()
 
-    def test_record_data_with_dependencies(self) -> None:
+    def test_record_data_uses_slots(
+        self, sample_record_identifier: RecordIdentifier
+    ) -> None:
+        """Records and identifiers should not carry a per-instance __dict__."""
+        data = RecordData(identifier=sample_record_identifier, data={})
+        assert not hasattr(sample_record_identifier, "__dict__")
+        assert not hasattr(data, "__dict__")
+        with pytest.raises(AttributeError):
+            data.extra = 1  # type: ignore[attr-defined]
+
+    def test_record_data_with_dependencies(
+        self, sample_record_identifier: RecordIdentifier
+    ) -> None:
         """Can create record with dependencies."""
-        user_rid = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
         order_rid = RecordIdentifier(
             table_name="orders",
             schema_name="public",
@@ -507,60 +583,40 @@ class TestRecordData:
         order_data = RecordData(
             identifier=order_rid,
             data={"id": 100, "user_id": 1},
-            dependencies={user_rid},
+            dependencies={sample_record_identifier},
         )
-        assert user_rid in order_data.dependencies
+        assert sample_record_identifier in order_data.dependencies
 
-    def test_record_data_is_hashable(self) -> None:
+    def test_record_data_is_hashable(
+        self, sample_record_identifier: RecordIdentifier
+    ) -> None:
         """RecordData should be hashable (based on identifier)."""
-        rid = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        data = RecordData(identifier=rid, data={"id": 1})
+        data = RecordData(identifier=sample_record_identifier, data={"id": 1})
         hash_val = hash(data)
         assert isinstance(hash_val, int)
+        assert hash_val == hash(sample_record_identifier)
 
-    def test_record_data_equality_based_on_identifier(self) -> None:
+    def test_record_data_equality_based_on_identifier(
+        self, record_data_trio: tuple[RecordData, RecordData, RecordData]
+    ) -> None:
         """RecordData equality should be based on identifier."""
-        rid = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        data1 = RecordData(identifier=rid, data={"id": 1, "name": "User 1"})
-        data2 = RecordData(identifier=rid, data={"id": 1, "name": "Different"})
-        assert data1 == data2  # Same identifier
+        data1, data2, data3 = record_data_trio
+        assert data1 == data2  # Same identifier, different data
+        assert data1 != data3
 
-    def test_record_data_in_set(self) -> None:
+    def test_record_data_in_set(
+        self, record_data_trio: tuple[RecordData, RecordData, RecordData]
+    ) -> None:
         """RecordData should work in sets."""
-        rid1 = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        rid2 = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(2,),
-        )
-        data1 = RecordData(identifier=rid1, data={"id": 1})
-        data2 = RecordData(identifier=rid1, data={"id": 1, "extra": "field"})
-        data3 = RecordData(identifier=rid2, data={"id": 2})
-
-        data_set = {data1, data2, data3}
+        data_set = set(record_data_trio)
         assert len(data_set) == 2  # data1 and data2 have same identifier
 
-    def test_record_data_not_equal_to_other_types(self) -> None:
+    def test_record_data_not_equal_to_other_types(
+        self, sample_record_identifier: RecordIdentifier
+    ) -> None:
         """RecordData should not equal other types."""
-        rid = RecordIdentifier(
-            table_name="users",
-            schema_name="public",
-            pk_values=(1,),
-        )
-        data = RecordData(identifier=rid, data={"id": 1})
-        assert data != rid  # Not equal to just the identifier
+        data = RecordData(identifier=sample_record_identifier, data={"id": 1})
+        assert data != sample_record_identifier  # Not equal to just the identifier
         assert data != {"id": 1}
         assert data != None  # noqa: E711
 
@@ -570,28 +626,24 @@ class TestTimeframeFilter:
 
     def test_create_basic_filter(self) -> None:
         """Can create a basic timeframe filter."""
-        start = datetime(2024, 1, 1)
-        end = datetime(2024, 12, 31)
         tf = TimeframeFilter(
             table_name="orders",
             column_name="created_at",
-            start_date=start,
-            end_date=end,
+            start_date=_START_2024,
+            end_date=_END_2024,
         )
         assert tf.table_name == "orders"
         assert tf.column_name == "created_at"
-        assert tf.start_date == start
-        assert tf.end_date == end
+        assert tf.start_date == _START_2024
+        assert tf.end_date == _END_2024
 
     def test_filter_repr(self) -> None:
         """repr should show readable date range."""
-        start = datetime(2024, 1, 1)
-        end = datetime(2024, 12, 31)
         tf = TimeframeFilter(
             table_name="orders",
             column_name="created_at",
-            start_date=start,
-            end_date=end,
+            start_date=_START_2024,
+            end_date=_END_2024,
         )
         repr_str = repr(tf)
         assert "orders.created_at" in repr_str
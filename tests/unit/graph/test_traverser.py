@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
@@ -20,6 +24,227 @@ from pgslice.graph.traverser import RelationshipTraverser
 from pgslice.graph.visited_tracker import VisitedTracker
 from pgslice.utils.exceptions import RecordNotFoundError
 
+Rows = list[tuple[Any, ...]] | Callable[[Any], list[tuple[Any, ...]]]
+
+
+# Tables are never mutated by the traverser, so they are built once per module;
+# the cursor, connection and tracker mocks stay per test.
+@pytest.fixture(scope="module")
+def sample_users_table() -> Table:
+    """Create a sample users table."""
+    return Table(
+        schema_name="public",
+        table_name="users",
+        columns=[
+            Column(
+                name="id",
+                data_type="integer",
+                udt_name="int4",
+                nullable=False,
+                is_primary_key=True,
+            ),
+            Column(
+                name="name",
+                data_type="text",
+                udt_name="text",
+                nullable=False,
+            ),
+        ],
+        primary_keys=["id"],
+        foreign_keys_outgoing=[],
+        foreign_keys_incoming=[],
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_orders_table() -> Table:
+    """Create a sample orders table with FK to users."""
+    return Table(
+        schema_name="public",
+        table_name="orders",
+        columns=[
+            Column(
+                name="id",
+                data_type="integer",
+                udt_name="int4",
+                nullable=False,
+                is_primary_key=True,
+            ),
+            Column(
+                name="user_id",
+                data_type="integer",
+                udt_name="int4",
+                nullable=False,
+            ),
+        ],
+        primary_keys=["id"],
+        foreign_keys_outgoing=[
+            ForeignKey(
+                constraint_name="fk_orders_user_id",
+                source_table="public.orders",
+                source_column="user_id",
+                target_table="public.users",
+                target_column="id",
+            )
+        ],
+        foreign_keys_incoming=[],
+    )
+
+
+@pytest.fixture(scope="module")
+def readonly_traverser() -> RelationshipTraverser:
+    """Traverser shared by tests that only read its settings or parse names."""
+    return RelationshipTraverser(
+        connection=MagicMock(),
+        schema_introspector=MagicMock(spec=SchemaIntrospector),
+        visited_tracker=VisitedTracker(),
+    )
+
+
+def _make_users_with_incoming_fk() -> Table:
+    """Users table referenced by orders.user_id."""
+    return Table(
+        schema_name="public",
+        table_name="users",
+        columns=[
+            Column(
+                name="id",
+                data_type="integer",
+                udt_name="int4",
+                nullable=False,
+                is_primary_key=True,
+            ),
+            Column(name="name", data_type="text", udt_name="text", nullable=False),
+        ],
+        primary_keys=["id"],
+        foreign_keys_outgoing=[],
+        foreign_keys_incoming=[
+            ForeignKey(
+                constraint_name="fk_orders_user_id",
+                source_table="public.orders",
+                source_column="user_id",
+                target_table="public.users",
+                target_column="id",
+                on_delete="CASCADE",
+            )
+        ],
+    )
+
+
+def _make_users_with_self_fk() -> Table:
+    """Users table whose manager_id references users.id."""
+    manager_fk = ForeignKey(
+        constraint_name="fk_users_manager",
+        source_table="public.users",
+        source_column="manager_id",
+        target_table="public.users",
+        target_column="id",
+        on_delete="SET NULL",
+    )
+    return Table(
+        schema_name="public",
+        table_name="users",
+        columns=[
+            Column(
+                name="id",
+                data_type="integer",
+                udt_name="int4",
+                nullable=False,
+                is_primary_key=True,
+            ),
+            Column(name="name", data_type="text", udt_name="text", nullable=False),
+            Column(
+                name="manager_id", data_type="integer", udt_name="int4", nullable=True
+            ),
+        ],
+        primary_keys=["id"],
+        foreign_keys_outgoing=[manager_fk],
+        foreign_keys_incoming=[manager_fk],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _users_referenced_by_orders() -> tuple[Table, Table]:
+    """Users table and the orders table whose user_id references it."""
+    fk = ForeignKey(
+        constraint_name="fk_orders_user",
+        source_table="public.orders",
+        source_column="user_id",
+        target_table="public.users",
+        target_column="id",
+        on_delete="CASCADE",
+    )
+    users = Table(
+        schema_name="public",
+        table_name="users",
+        columns=[
+            Column(
+                name="id",
+                data_type="integer",
+                udt_name="int4",
+                nullable=False,
+                is_primary_key=True,
+            ),
+        ],
+        primary_keys=["id"],
+        foreign_keys_outgoing=[],
+        foreign_keys_incoming=[fk],
+    )
+    orders = Table(
+        schema_name="public",
+        table_name="orders",
+        columns=[
+            Column(
+                name="id",
+                data_type="integer",
+                udt_name="int4",
+                nullable=False,
+                is_primary_key=True,
+            ),
+            Column(
+                name="user_id", data_type="integer", udt_name="int4", nullable=False
+            ),
+            Column(
+                name="created_at",
+                data_type="timestamp",
+                udt_name="timestamp",
+                nullable=False,
+            ),
+        ],
+        primary_keys=["id"],
+        foreign_keys_outgoing=[fk],
+        foreign_keys_incoming=[],
+    )
+    return users, orders
+
+
+@contextmanager
+def _cursor_context(cursor: MagicMock) -> Iterator[MagicMock]:
+    """Stand-in for ``connection.cursor()`` used as a context manager."""
+    yield cursor
+
+
+def _route_queries(
+    cursor: MagicMock,
+    routes: list[tuple[str, list[str], Rows]],
+) -> None:
+    """
+    Answer cursor queries by the first route whose marker is in the SQL.
+
+    Each route is (marker, column names, rows); rows may be a callable
+    taking the query params.
+    """
+
+    def execute(query: str, params: Any = None) -> None:
+        for marker, columns, rows in routes:
+            if marker in query:
+                cursor.description = [(col,) for col in columns]
+                cursor.fetchall.return_value = rows(params) if callable(rows) else rows
+                return
+
+    cursor.fetchall.side_effect = None
+    cursor.execute.side_effect = execute
+
 
 class TestRelationshipTraverser:
     """Tests for RelationshipTraverser class."""
@@ -32,9 +257,9 @@ class TestRelationshipTraverser:
         cursor.fetchone = MagicMock()
         # Set up fetchall to return the same data as fetchone for batch compatibility
         cursor.fetchall = MagicMock(
-            side_effect=lambda: [cursor.fetchone.return_value]
-            if cursor.fetchone.return_value
-            else []
+            side_effect=lambda: (
+                [cursor.fetchone.return_value] if cursor.fetchone.return_value else []
+            )
         )
         cursor.description = [("id",), ("name",)]
         return cursor
@@ -43,87 +268,19 @@ class TestRelationshipTraverser:
     def mock_connection(self, mock_cursor: MagicMock) -> MagicMock:
         """Create a mock connection."""
         conn = MagicMock()
-        cursor_cm = MagicMock()
-        cursor_cm.__enter__ = MagicMock(return_value=mock_cursor)
-        cursor_cm.__exit__ = MagicMock(return_value=False)
-        conn.cursor.return_value = cursor_cm
+        conn.cursor.side_effect = lambda: _cursor_context(mock_cursor)
         return conn
 
-    @pytest.fixture
-    def sample_users_table(self) -> Table:
-        """Create a sample users table."""
-        return Table(
-            schema_name="public",
-            table_name="users",
-            columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
-                Column(
-                    name="name",
-                    data_type="text",
-                    udt_name="text",
-                    nullable=False,
-                ),
-            ],
-            primary_keys=["id"],
-            foreign_keys_outgoing=[],
-            foreign_keys_incoming=[],
-        )
-
-    @pytest.fixture
-    def sample_orders_table(self) -> Table:
-        """Create a sample orders table with FK to users."""
-        return Table(
-            schema_name="public",
-            table_name="orders",
-            columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
-                Column(
-                    name="user_id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                ),
-            ],
-            primary_keys=["id"],
-            foreign_keys_outgoing=[
-                ForeignKey(
-                    constraint_name="fk_orders_user_id",
-                    source_table="public.orders",
-                    source_column="user_id",
-                    target_table="public.users",
-                    target_column="id",
-                )
-            ],
-            foreign_keys_incoming=[],
-        )
-
     @pytest.fixture
     def mock_introspector(
         self, sample_users_table: Table, sample_orders_table: Table
     ) -> MagicMock:
         """Create a mock introspector that returns sample tables."""
         introspector = MagicMock(spec=SchemaIntrospector)
-
-        def get_table_metadata(schema: str, table: str) -> Table:
-            if table == "users":
-                return sample_users_table
-            elif table == "orders":
-                return sample_orders_table
-            raise ValueError(f"Unknown table: {table}")
-
-        introspector.get_table_metadata = MagicMock(side_effect=get_table_metadata)
+        tables = {"users": sample_users_table, "orders": sample_orders_table}
+        introspector.get_table_metadata = MagicMock(
+            side_effect=lambda schema, table: tables[table]
+        )
         return introspector
 
     @pytest.fixture
@@ -165,9 +322,11 @@ class TestInit(TestRelationshipTraverser):
         """Should store the introspector."""
         assert traverser.introspector == mock_introspector
 
-    def test_default_wide_mode_false(self, traverser: RelationshipTraverser) -> None:
+    def test_default_wide_mode_false(
+        self, readonly_traverser: RelationshipTraverser
+    ) -> None:
         """Default wide_mode should be False."""
-        assert traverser.wide_mode is False
+        assert readonly_traverser.wide_mode is False
 
     def test_custom_wide_mode(
         self,
@@ -250,12 +409,8 @@ class TestTraverse(TestRelationshipTraverser):
     ) -> None:
         """Should not visit the same record twice."""
         # Pre-mark the record as visited
-        visited_tracker.mark_visited(
-            RecordIdentifier(
-                schema_name="public",
-                table_name="users",
-                pk_values=(1,),
-            )
+        visited_tracker.mark_visited_many(
+            [RecordIdentifier(schema_name="public", table_name="users", pk_values=(1,))]
         )
 
         mock_cursor.fetchone.return_value = (1, "Test User")
@@ -456,18 +611,31 @@ class TestFetchRecord(TestRelationshipTraverser):
 class TestParseTableName(TestRelationshipTraverser):
     """Tests for _parse_table_name method."""
 
-    def test_parses_qualified_name(self, traverser: RelationshipTraverser) -> None:
+    def test_parses_qualified_name(
+        self, readonly_traverser: RelationshipTraverser
+    ) -> None:
         """Should parse schema.table format."""
-        schema, table = traverser._parse_table_name("public.users")
+        schema, table = readonly_traverser._parse_table_name("public.users")
         assert schema == "public"
         assert table == "users"
 
-    def test_parses_simple_name(self, traverser: RelationshipTraverser) -> None:
+    def test_parses_simple_name(
+        self, readonly_traverser: RelationshipTraverser
+    ) -> None:
         """Should default to public schema."""
-        schema, table = traverser._parse_table_name("users")
+        schema, table = readonly_traverser._parse_table_name("users")
         assert schema == "public"
         assert table == "users"
 
+    def test_reuses_parsed_names(
+        self, readonly_traverser: RelationshipTraverser
+    ) -> None:
+        """Repeated names should return the same string objects."""
+        first = readonly_traverser._parse_table_name("public.users")
+        second = readonly_traverser._parse_table_name("public.users")
+        assert first[0] is second[0]
+        assert first[1] is second[1]
+
 
 class TestGetTableMetadata(TestRelationshipTraverser):
     """Tests for _get_table_metadata method."""
@@ -488,7 +656,9 @@ class TestGetTableMetadata(TestRelationshipTraverser):
 class TestResolveForeignKeyTarget(TestRelationshipTraverser):
     """Tests for _resolve_foreign_key_target method."""
 
-    def test_returns_none_for_null_fk(self, traverser: RelationshipTraverser) -> None:
+    def test_returns_none_for_null_fk(
+        self, traverser: RelationshipTraverser, sample_orders_table: Table
+    ) -> None:
         """Should return None for NULL FK value."""
         record = RecordData(
             identifier=RecordIdentifier(
@@ -499,14 +669,14 @@ class TestResolveForeignKeyTarget(TestRelationshipTraverser):
             data={"id": 1, "user_id": None},
         )
 
-        fk = MagicMock()
-        fk.source_column = "user_id"
-        fk.target_table = "public.users"
+        fk = sample_orders_table.foreign_keys_outgoing[0]  # orders.user_id -> users
 
         result = traverser._resolve_foreign_key_target(record, fk)
         assert result is None
 
-    def test_returns_record_identifier(self, traverser: RelationshipTraverser) -> None:
+    def test_returns_record_identifier(
+        self, traverser: RelationshipTraverser, sample_orders_table: Table
+    ) -> None:
         """Should return RecordIdentifier for valid FK."""
         record = RecordData(
             identifier=RecordIdentifier(
@@ -517,9 +687,7 @@ class TestResolveForeignKeyTarget(TestRelationshipTraverser):
             data={"id": 1, "user_id": 42},
         )
 
-        fk = MagicMock()
-        fk.source_column = "user_id"
-        fk.target_table = "public.users"
+        fk = sample_orders_table.foreign_keys_outgoing[0]  # orders.user_id -> users
 
         result = traverser._resolve_foreign_key_target(record, fk)
 
@@ -531,181 +699,95 @@ class TestResolveForeignKeyTarget(TestRelationshipTraverser):
 class TestIncomingFkTraversal(TestRelationshipTraverser):
     """Tests for incoming FK traversal (reverse relationships)."""
 
-    def test_follows_incoming_fks(
+    @pytest.mark.parametrize(
+        ("wide_mode", "expected_orders"),
+        [(True, {"100", "101"}), (False, {"100"})],
+        ids=["wide", "strict"],
+    )
+    def test_incoming_fk_traversal(
         self,
-        traverser: RelationshipTraverser,
-        mock_introspector: MagicMock,
-        mock_cursor: MagicMock,
-    ) -> None:
-        """Should follow incoming FKs to find referencing records."""
-        from pgslice.graph.models import ForeignKey
-
-        # Setup: users table has incoming FK from orders
-        users_table = MagicMock()
-        users_table.table_name = "users"
-        users_table.schema_name = "public"
-        users_table.primary_keys = ["id"]
-        users_table.foreign_keys_incoming = [
-            ForeignKey(
-                constraint_name="fk_orders_user_id",
-                source_table="public.orders",
-                source_column="user_id",
-                target_table="public.users",
-                target_column="id",
-                on_delete="CASCADE",
-            )
-        ]
-        users_table.foreign_keys_outgoing = []
-
-        mock_introspector.get_table_metadata.return_value = users_table
-
-        # Mock database to return user record, then referencing order
-        mock_cursor.fetchone.side_effect = [
-            (1, "Alice"),  # User record
-            (100, 1, "Order 1"),  # Order referencing user
-            None,  # No more orders
-        ]
-
-        results = traverser.traverse("users", "public", (1,))
-
-        # Should find both user and referencing order
-        assert len(results) >= 1
-
-    def test_skips_incoming_fks_when_disabled(
-        self,
-        mock_introspector: MagicMock,
         mock_cursor: MagicMock,
         mock_connection: MagicMock,
         visited_tracker: VisitedTracker,
+        sample_orders_table: Table,
+        wide_mode: bool,
+        expected_orders: set[str],
     ) -> None:
-        """Should skip incoming FKs in strict mode (wide_mode=False)."""
-        from pgslice.graph.models import ForeignKey
-
-        # Create traverser with wide_mode=False (strict mode)
+        """
+        Records reached via outgoing FKs follow incoming FKs only in wide mode.
+
+        Starting at order 100 reaches user 1; only wide mode then looks up
+        the other orders referencing user 1.
+        """
+        tables = {
+            "users": _make_users_with_incoming_fk(),
+            "orders": sample_orders_table,
+        }
+        introspector = MagicMock(spec=SchemaIntrospector)
+        introspector.get_table_metadata.side_effect = lambda s, t: tables[t]
+        _route_queries(
+            mock_cursor,
+            [
+                ('WHERE "user_id" IN', ["id", "user_id"], [(100, 1), (101, 1)]),
+                ('"public"."users"', ["id", "name"], [(1, "Alice")]),
+                ('"public"."orders"', ["id", "user_id"], [(100, 1), (101, 1)]),
+            ],
+        )
         traverser = RelationshipTraverser(
             connection=mock_connection,
-            schema_introspector=mock_introspector,
+            schema_introspector=introspector,
             visited_tracker=visited_tracker,
-            wide_mode=False,
+            wide_mode=wide_mode,
         )
 
-        users_table = MagicMock()
-        users_table.table_name = "users"
-        users_table.schema_name = "public"
-        users_table.primary_keys = ["id"]
-        users_table.foreign_keys_incoming = [
-            ForeignKey(
-                constraint_name="fk_orders_user_id",
-                source_table="public.orders",
-                source_column="user_id",
-                target_table="public.users",
-                target_column="id",
-                on_delete="CASCADE",
-            )
-        ]
-        users_table.foreign_keys_outgoing = []
-
-        mock_introspector.get_table_metadata.return_value = users_table
-        mock_cursor.fetchone.return_value = (1, "Alice")
+        results = traverser.traverse("orders", 100)
 
-        results = traverser.traverse("users", 1, "public")
-
-        # Should only find the user, not referencing orders
-        assert len(results) == 1
+        found = {(r.identifier.table_name, r.identifier.pk_values[0]) for r in results}
+        assert found == {("users", "1")} | {("orders", pk) for pk in expected_orders}
 
 
 class TestWideModeVsStrictMode(TestRelationshipTraverser):
     """Tests for wide_mode vs strict_mode behavior."""
 
-    def test_wide_mode_follows_self_referencing_fk(
+    @pytest.mark.parametrize(
+        ("wide_mode", "expected_users"),
+        [(True, {"1", "2"}), (False, {"2"})],
+        ids=["wide", "strict"],
+    )
+    def test_self_referencing_incoming_fk(
         self,
-        mock_introspector: MagicMock,
         mock_cursor: MagicMock,
         mock_connection: MagicMock,
         visited_tracker: VisitedTracker,
+        wide_mode: bool,
+        expected_users: set[str],
     ) -> None:
-        """Wide mode should follow self-referencing FKs."""
-        from pgslice.graph.models import ForeignKey
-
-        # Create traverser with wide_mode=True
-        traverser = RelationshipTraverser(
-            connection=mock_connection,
-            schema_introspector=mock_introspector,
-            visited_tracker=visited_tracker,
-            wide_mode=True,
+        """Only wide mode follows a self-referencing FK back to reports."""
+        users = {"1": (1, "Employee", 2), "2": (2, "Manager", None)}
+        introspector = MagicMock(spec=SchemaIntrospector)
+        introspector.get_table_metadata.return_value = _make_users_with_self_fk()
+        _route_queries(
+            mock_cursor,
+            [
+                ('WHERE "manager_id" IN', ["id", "manager_id"], [(1, 2)]),
+                (
+                    '"public"."users"',
+                    ["id", "name", "manager_id"],
+                    # Batch fetches return only the requested users
+                    lambda params: [users[pk] for pk in params if pk in users],
+                ),
+            ],
         )
-
-        # Users table with self-referencing FK (manager_id)
-        users_table = MagicMock()
-        users_table.table_name = "users"
-        users_table.schema_name = "public"
-        users_table.primary_keys = ["id"]
-        users_table.foreign_keys_outgoing = [
-            ForeignKey(
-                constraint_name="fk_users_manager",
-                source_table="public.users",
-                source_column="manager_id",
-                target_table="public.users",
-                target_column="id",
-                on_delete="SET NULL",
-            )
-        ]
-        users_table.foreign_keys_incoming = []
-
-        mock_introspector.get_table_metadata.return_value = users_table
-
-        # User 1 has manager_id=2
-        mock_cursor.fetchone.side_effect = [
-            (1, "Employee", 2),  # User 1
-            (2, "Manager", None),  # User 2 (manager)
-        ]
-
-        results = traverser.traverse("users", "public", (1,))
-
-        # In wide mode, should follow self-referencing FK and find both users
-        assert len(results) >= 1
-
-    def test_strict_mode_skips_self_referencing_fk(
-        self,
-        mock_introspector: MagicMock,
-        mock_cursor: MagicMock,
-        mock_connection: MagicMock,
-        visited_tracker: VisitedTracker,
-    ) -> None:
-        """Strict mode should skip self-referencing FKs."""
-        from pgslice.graph.models import ForeignKey
-
-        # Create traverser with wide_mode=False (strict mode)
         traverser = RelationshipTraverser(
             connection=mock_connection,
-            schema_introspector=mock_introspector,
+            schema_introspector=introspector,
             visited_tracker=visited_tracker,
-            wide_mode=False,
+            wide_mode=wide_mode,
         )
 
-        users_table = MagicMock()
-        users_table.table_name = "users"
-        users_table.schema_name = "public"
-        users_table.primary_keys = ["id"]
-        users_table.foreign_keys_outgoing = [
-            ForeignKey(
-                constraint_name="fk_users_manager",
-                source_table="public.users",
-                source_column="manager_id",
-                target_table="public.users",
-                target_column="id",
-                on_delete="SET NULL",
-            )
-        ]
-        users_table.foreign_keys_incoming = []
-
-        mock_introspector.get_table_metadata.return_value = users_table
-        mock_cursor.fetchone.return_value = (1, "Employee", 2)
+        results = traverser.traverse("users", 2)
 
-        results = traverser.traverse("users", 1, "public")
-
-        # In strict mode, should skip self-referencing FK
-        assert len(results) == 1
+        assert {r.identifier.pk_values[0] for r in results} == expected_users
 
 
 class TestTimeframeFiltering(TestRelationshipTraverser):
@@ -719,10 +801,6 @@ class TestTimeframeFiltering(TestRelationshipTraverser):
         visited_tracker: VisitedTracker,
     ) -> None:
         """Should apply timeframe filters when fetching records."""
-        from datetime import datetime
-
-        from pgslice.graph.models import TimeframeFilter
-
         # Create traverser with timeframe filter
         traverser = RelationshipTraverser(
             connection=mock_connection,
@@ -738,20 +816,15 @@ class TestTimeframeFiltering(TestRelationshipTraverser):
             ],
         )
 
-        orders_table = MagicMock()
-        orders_table.table_name = "orders"
-        orders_table.schema_name = "public"
-        orders_table.primary_keys = ["id"]
-        orders_table.foreign_keys_outgoing = []
-        orders_table.foreign_keys_incoming = []
-
-        mock_introspector.get_table_metadata.return_value = orders_table
-        mock_cursor.fetchone.return_value = (1, "Order 1", "2024-06-15")
+        # mock_introspector serves the real sample_orders_table
+        mock_cursor.fetchone.return_value = (1, "Order 1")
 
-        traverser.traverse("orders", "public", (1,))
+        traverser.traverse("orders", 1)
 
         # Should apply timeframe filter in SQL query
-        assert mock_cursor.execute.called
+        query, params = mock_cursor.execute.call_args[0]
+        assert '"created_at" BETWEEN %s AND %s' in query
+        assert params[-2:] == [datetime(2024, 1, 1), datetime(2024, 12, 31)]
 
 
 class TestFindReferencingRecords:
@@ -774,63 +847,7 @@ class TestFindReferencingRecords:
     ) -> None:
         """Should execute SQL to find records with incoming FKs."""
         # Setup: orders table has FK to users
-        users_table = Table(
-            schema_name="public",
-            table_name="users",
-            columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
-            ],
-            primary_keys=["id"],
-            foreign_keys_outgoing=[],
-            foreign_keys_incoming=[
-                ForeignKey(
-                    constraint_name="fk_orders_user",
-                    source_table="public.orders",
-                    source_column="user_id",
-                    target_table="public.users",
-                    target_column="id",
-                    on_delete="CASCADE",
-                )
-            ],
-        )
-
-        orders_table = Table(
-            schema_name="public",
-            table_name="orders",
-            columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
-                Column(
-                    name="user_id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                ),
-            ],
-            primary_keys=["id"],
-            foreign_keys_outgoing=[
-                ForeignKey(
-                    constraint_name="fk_orders_user",
-                    source_table="public.orders",
-                    source_column="user_id",
-                    target_table="public.users",
-                    target_column="id",
-                    on_delete="CASCADE",
-                )
-            ],
-            foreign_keys_incoming=[],
-        )
+        users_table, orders_table = _users_referenced_by_orders()
 
         mock_introspector.get_table_metadata.side_effect = [
             users_table,
@@ -876,60 +893,7 @@ class TestFindReferencingRecords:
         self, mock_connection: MagicMock, mock_introspector: MagicMock
     ) -> None:
         """Should apply timeframe filter when finding referencing records."""
-        users_table = Table(
-            schema_name="public",
-            table_name="users",
-            columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
-            ],
-            primary_keys=["id"],
-            foreign_keys_outgoing=[],
-            foreign_keys_incoming=[
-                ForeignKey(
-                    constraint_name="fk_orders_user",
-                    source_table="public.orders",
-                    source_column="user_id",
-                    target_table="public.users",
-                    target_column="id",
-                    on_delete="CASCADE",
-                )
-            ],
-        )
-
-        orders_table = Table(
-            schema_name="public",
-            table_name="orders",
-            columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
-                Column(
-                    name="user_id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                ),
-                Column(
-                    name="created_at",
-                    data_type="timestamp",
-                    udt_name="timestamp",
-                    nullable=False,
-                ),
-            ],
-            primary_keys=["id"],
-            foreign_keys_outgoing=[],
-            foreign_keys_incoming=[],
-        )
+        users_table, orders_table = _users_referenced_by_orders()
 
         mock_introspector.get_table_metadata.side_effect = [
             orders_table,
@@ -1039,40 +1003,7 @@ class TestFindReferencingRecords:
         self, mock_connection: MagicMock, mock_introspector: MagicMock
     ) -> None:
         """Should log warning for composite PKs but still process."""
-        users_table = Table(
-            schema_name="public",
-            table_name="users",
-            columns=[
-                Column(
-                    name="id",
-                    data_type="integer",
-                    udt_name="int4",
-                    nullable=False,
-                    is_primary_key=True,
-                ),
-            ],
-            primary_keys=["id"],
-            foreign_keys_outgoing=[],
-            foreign_keys_incoming=[
-                ForeignKey(
-                    constraint_name="fk_orders_user",
-                    source_table="public.orders",
-                    source_column="user_id",
-                    target_table="public.users",
-                    target_column="id",
-                    on_delete="CASCADE",
-                )
-            ],
-        )
-
-        orders_table = Table(
-            schema_name="public",
-            table_name="orders",
-            columns=[],
-            primary_keys=["id"],
-            foreign_keys_outgoing=[],
-            foreign_keys_incoming=[],
-        )
+        users_table, orders_table = _users_referenced_by_orders()
 
         mock_introspector.get_table_metadata.side_effect = [
             orders_table,
@@ -1225,10 +1156,7 @@ class TestTimeframeFilterOnlyAppliedToStartingTable:
     def mock_connection(self, mock_cursor: MagicMock) -> MagicMock:
         """Create a mock connection."""
         conn = MagicMock()
-        cursor_cm = MagicMock()
-        cursor_cm.__enter__ = MagicMock(return_value=mock_cursor)
-        cursor_cm.__exit__ = MagicMock(return_value=False)
-        conn.cursor.return_value = cursor_cm
+        conn.cursor.side_effect = lambda: _cursor_context(mock_cursor)
         return conn
 
     @pytest.fixture
@@ -1315,14 +1243,10 @@ class TestTimeframeFilterOnlyAppliedToStartingTable:
         )
 
         # Mock introspector to return our tables
-        def get_table_metadata(schema: str, table: str) -> Table:
-            if table == "film":
-                return film_table
-            elif table == "film_actor":
-                return film_actor_table
-            raise ValueError(f"Unknown table: {table}")
-
-        mock_introspector.get_table_metadata = MagicMock(side_effect=get_table_metadata)
+        tables = {"film": film_table, "film_actor": film_actor_table}
+        mock_introspector.get_table_metadata = MagicMock(
+            side_effect=lambda schema, table: tables[table]
+        )
 
         # Setup cursor mock responses
         # First call: fetch film record
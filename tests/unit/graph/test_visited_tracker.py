@@ -93,6 +93,18 @@ class TestMarkVisited(TestVisitedTracker):
         assert tracker.is_visited(record_id) is True
         assert tracker.get_visited_count() == 1
 
+    def test_mark_visited_many(
+        self,
+        tracker: VisitedTracker,
+        record_id: RecordIdentifier,
+        another_record_id: RecordIdentifier,
+    ) -> None:
+        """Can mark several records at once, skipping duplicates."""
+        tracker.mark_visited_many([record_id, another_record_id, record_id])
+        assert tracker.is_visited(record_id) is True
+        assert tracker.is_visited(another_record_id) is True
+        assert tracker.get_visited_count() == 2
+
 
 class TestReset(TestVisitedTracker):
     """Tests for reset method."""